@@ -23,6 +23,16 @@ echo "  pytest tests/spectra/ -v          # Run Spectra Python tests"
 echo "  pytest tests/aurora/ -v           # Run Aurora system tests"
 echo ""
 
+echo -e "${BLUE}Watch Mode:${NC}"
+echo "  python -m framework.watch_daemon  # Rerun affected tests on every change"
+echo "  python -m framework.watch_daemon --once --workers 4"
+echo ""
+
+echo -e "${BLUE}Distributed Runs:${NC}"
+echo "  python -m framework.distributed coordinator --port 5555 --local-workers 4"
+echo "  python -m framework.distributed worker --connect coordinator-host:5555"
+echo ""
+
 echo -e "${BLUE}Test Filtering:${NC}"
 echo "  pytest tests/ -k 'initialization' # Run tests matching pattern"
 echo "  pytest tests/ -k 'gps'            # Run GPS-related tests"
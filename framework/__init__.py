@@ -9,5 +9,19 @@ __author__ = "Software Engineer Intern"
 from .test_base import TestBase
 from .fixtures import TestFixtures
 from .report_generator import ReportGenerator
+from .nmea_parser import NMEAStreamParser
+from .state_machine import SpectraStateMachine, StateSpaceExplorer
+from .metrics_engine import MetricsEngine
+from .geodesy import accuracy_statistics, geodetic_to_enu
+from .timestamps import check_timestamps, parse_iso8601
+from .kalman import kalman_filter, rts_smooth
+from .tile_pyramid import TilePyramid
+# The watch_daemon and distributed command-line modules are not imported
+# here: runpy warns when the package has already imported the module it runs.
 
-__all__ = ["TestBase", "TestFixtures", "ReportGenerator"]
+__all__ = [
+    "TestBase", "TestFixtures", "ReportGenerator", "NMEAStreamParser",
+    "SpectraStateMachine", "StateSpaceExplorer", "MetricsEngine",
+    "accuracy_statistics", "geodetic_to_enu", "check_timestamps", "parse_iso8601",
+    "kalman_filter", "rts_smooth", "TilePyramid",
+]
@@ -0,0 +1,641 @@
+"""
+Multi-node coordinator/worker test execution over TCP.
+
+A coordinator serves unittest test IDs (discovered from ``tests/``) to
+workers using newline-delimited JSON over a plain TCP socket; no broker is
+needed. Tests are grouped by class and handed out into per-worker queues,
+so a worker tends to run related tests back to back. A worker whose queue
+runs dry takes the next group, or steals half of the longest queue once
+no groups are left.
+
+Workers keep a class's setUpClass fixture (and its module's) alive across
+consecutive leases of that class, and tear it down when the coordinator
+marks a lease as the last of its class in the worker's queue or the next
+lease belongs to another class.
+
+Each test handed to a worker is a lease. Workers heartbeat while they run;
+a worker that stops heartbeating, disconnects, or holds a lease past its
+timeout is dropped, and its lease and queued tests are re-queued. A test
+that is lost ``max_attempts`` times is reported as failed. Local workers
+that crash are restarted; once no worker is left, the remaining tests are
+reported as failed instead of waiting forever. Results stream back into
+one merged ReportGenerator as they arrive.
+
+Usage:
+    python -m framework.distributed coordinator [--port P] [--local-workers N]
+    python -m framework.distributed worker --connect HOST:PORT
+"""
+
+import argparse
+import json
+import os
+import socket
+import socketserver
+import subprocess
+import sys
+import threading
+import time
+import traceback
+import unittest
+from collections import deque
+from pathlib import Path
+from typing import Any, Callable, Deque, Dict, List, Optional, Sequence, Tuple
+
+from .report_generator import ReportGenerator
+from .result_stream import StreamingResult
+
+
+# _ErrorHolder descriptions of teardown failures, e.g. "tearDownClass (mod.Class)".
+_TEARDOWN_HOOKS = ("tearDownClass ", "tearDownModule ")
+
+
+def _owner(test_id: str) -> str:
+    """Dotted name of the class (or module) a test ID belongs to."""
+    return test_id.rsplit(".", 1)[0]
+
+
+def _iter_cases(suite: unittest.TestSuite):
+    """Yield the individual test cases inside a (nested) suite."""
+    for item in suite:
+        if isinstance(item, unittest.TestSuite):
+            yield from _iter_cases(item)
+        else:
+            yield item
+
+
+def discover_test_ids(root: str = ".", start_dir: str = "tests",
+                      pattern: str = "test_*.py") -> List[str]:
+    """Dotted IDs of every test under ``start_dir``, in discovery order."""
+    root = str(Path(root).resolve())
+    if root not in sys.path:
+        sys.path.insert(0, root)
+    suite = unittest.TestLoader().discover(str(Path(root) / start_dir),
+                                           pattern=pattern, top_level_dir=root)
+    return [case.id() for case in _iter_cases(suite)]
+
+
+def _group_by_class(test_ids: Sequence[str]) -> List[List[str]]:
+    """Split test IDs into runs that share a test class."""
+    groups: List[List[str]] = []
+    for test_id in test_ids:
+        if groups and _owner(groups[-1][0]) == _owner(test_id):
+            groups[-1].append(test_id)
+        else:
+            groups.append([test_id])
+    return groups
+
+
+def _send(stream, lock: threading.Lock, message: Dict[str, Any]):
+    """Write one JSON line to ``stream``."""
+    data = (json.dumps(message) + "\n").encode()
+    with lock:
+        stream.write(data)
+        stream.flush()
+
+
+class _WorkerState:
+    """Coordinator-side bookkeeping for one connected worker."""
+
+    def __init__(self, worker_id: str, connection: Optional[socket.socket]):
+        self.worker_id = worker_id
+        self.connection = connection
+        self.queue: Deque[str] = deque()
+        self.lease: Optional[str] = None
+        self.lease_deadline = 0.0
+        self.last_seen = time.monotonic()
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    """Serves one worker connection for the coordinator."""
+
+    def handle(self):
+        coordinator: "Coordinator" = self.server.coordinator
+        lock = threading.Lock()
+        worker_id = None
+        try:
+            for line in self.rfile:
+                message = json.loads(line)
+                kind = message["type"]
+                if kind == "hello":
+                    worker_id = message["worker"]
+                    coordinator.register(worker_id, self.connection)
+                    continue
+                if worker_id is None:
+                    break
+                if kind == "heartbeat":
+                    coordinator.heartbeat(worker_id)
+                    continue
+                if kind == "result":
+                    coordinator.complete(worker_id, message["test_id"], message["records"])
+                reply = coordinator.next_test(worker_id)
+                if reply is None:
+                    break  # worker was dropped
+                _send(self.wfile, lock, reply)
+        except (OSError, ValueError):
+            pass
+        finally:
+            if worker_id is not None:
+                coordinator.drop_worker(worker_id, "connection closed", self.connection)
+
+
+class _Server(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+class Coordinator:
+    """Hands out test leases to TCP workers and merges their results."""
+
+    def __init__(self, test_ids: Sequence[str], host: str = "127.0.0.1", port: int = 0,
+                 report: Optional[ReportGenerator] = None,
+                 on_result: Optional[Callable[[Dict], None]] = None,
+                 lease_timeout: float = 600.0, heartbeat_timeout: float = 10.0,
+                 max_attempts: int = 2, wait_delay: float = 0.1):
+        """
+        Initialize the coordinator.
+
+        Args:
+            test_ids: Dotted unittest IDs to run, e.g. from discover_test_ids.
+            host: Interface to listen on.
+            port: TCP port; 0 picks a free one (see ``address``).
+            report: Report that receives every result.
+            on_result: Optional callback invoked as each result arrives.
+            lease_timeout: Seconds a single test may run before it is re-queued.
+            heartbeat_timeout: Seconds of worker silence before it is dropped.
+            max_attempts: Times a test may be handed out before it is failed.
+            wait_delay: Seconds an idle worker waits before asking again.
+        """
+        self.host, self.port = host, port
+        self.report = report
+        self.on_result = on_result
+        self.lease_timeout = lease_timeout
+        self.heartbeat_timeout = heartbeat_timeout
+        self.max_attempts = max_attempts
+        self.wait_delay = wait_delay
+        self.results: List[Dict] = []
+
+        test_ids = list(test_ids)
+        self._test_ids = test_ids
+        self._pending: Deque[List[str]] = deque(_group_by_class(test_ids))
+        self._remaining = set(test_ids)
+        self._attempts: Dict[str, int] = {}
+        self._leases_granted: Dict[str, int] = {}
+        self._workers: Dict[str, _WorkerState] = {}
+        self._lock = threading.RLock()
+        self._done = threading.Event()
+        self._stopping = threading.Event()
+        self._server: Optional[_Server] = None
+        if not self._remaining:
+            self._done.set()
+
+    @property
+    def address(self) -> Tuple[str, int]:
+        """Host and port the coordinator is listening on."""
+        return self.host, self.port
+
+    @property
+    def worker_count(self) -> int:
+        """Number of currently registered workers."""
+        with self._lock:
+            return len(self._workers)
+
+    def has_worker(self, worker_id: str) -> bool:
+        """Check whether ``worker_id`` is currently registered."""
+        with self._lock:
+            return worker_id in self._workers
+
+    def leases_granted(self, worker_id: str) -> int:
+        """Total leases ever handed to ``worker_id``."""
+        with self._lock:
+            return self._leases_granted.get(worker_id, 0)
+
+    # -- scheduling -------------------------------------------------------
+
+    def register(self, worker_id: str, connection: Optional[socket.socket] = None):
+        """Add a worker; a reconnecting worker ID replaces its old state."""
+        with self._lock:
+            if worker_id in self._workers:
+                self.drop_worker(worker_id, "reconnected")
+            self._workers[worker_id] = _WorkerState(worker_id, connection)
+
+    def heartbeat(self, worker_id: str):
+        """Record that a worker is alive."""
+        with self._lock:
+            state = self._workers.get(worker_id)
+            if state is not None:
+                state.last_seen = time.monotonic()
+
+    def next_test(self, worker_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Reply for a worker asking for work.
+
+        Returns a ``lease`` (with ``test_id`` and ``last_in_class``, true
+        when the worker's queue holds no further test of the same class),
+        ``wait`` (other leases are still outstanding) or ``shutdown``
+        message, or None if the worker is no longer registered.
+        """
+        with self._lock:
+            state = self._workers.get(worker_id)
+            if state is None:
+                return None
+            state.last_seen = time.monotonic()
+            if self._done.is_set():
+                return {"type": "shutdown"}
+            while True:
+                if not state.queue:
+                    self._refill(state)
+                if not state.queue:
+                    return {"type": "wait", "delay": self.wait_delay}
+                test_id = state.queue.popleft()
+                if test_id in self._remaining:  # skip late-completed re-queues
+                    break
+            self._attempts[test_id] = self._attempts.get(test_id, 0) + 1
+            self._leases_granted[worker_id] = self._leases_granted.get(worker_id, 0) + 1
+            state.lease = test_id
+            state.lease_deadline = state.last_seen + self.lease_timeout
+            following = next((t for t in state.queue if t in self._remaining), None)
+            last_in_class = following is None or _owner(following) != _owner(test_id)
+            return {"type": "lease", "test_id": test_id, "last_in_class": last_in_class}
+
+    def _refill(self, state: _WorkerState):
+        """Give an idle worker the next group, or steal from the busiest queue."""
+        if self._pending:
+            state.queue.extend(self._pending.popleft())
+            return
+        victim = max(self._workers.values(), key=lambda w: len(w.queue))
+        if victim is state or not victim.queue:
+            return
+        for _ in range((len(victim.queue) + 1) // 2):
+            state.queue.appendleft(victim.queue.pop())
+
+    def complete(self, worker_id: str, test_id: str, records: Sequence[Dict]):
+        """Accept a finished lease; duplicate results for a test are ignored."""
+        with self._lock:
+            state = self._workers.get(worker_id)
+            if state is not None and state.lease == test_id:
+                state.lease = None
+            if test_id not in self._remaining:
+                return
+            self._remaining.discard(test_id)
+            for record in records:
+                self._emit(dict(record, worker=worker_id))
+            if not self._remaining:
+                self._done.set()
+
+    def drop_worker(self, worker_id: str, reason: str,
+                    connection: Optional[socket.socket] = None):
+        """
+        Forget a worker and re-queue its lease and unstarted tests.
+
+        If ``connection`` is given, the worker is only dropped while that is
+        still its connection, so a stale handler cannot drop a reconnect.
+        """
+        with self._lock:
+            state = self._workers.get(worker_id)
+            if state is None or (connection is not None and state.connection is not connection):
+                return
+            del self._workers[worker_id]
+            if state.connection is not None:
+                try:
+                    state.connection.shutdown(socket.SHUT_RDWR)
+                except OSError:
+                    pass
+            requeue = [t for t in state.queue if t in self._remaining]
+            lost = state.lease
+            if lost is not None and lost in self._remaining:
+                if self._attempts.get(lost, 0) < self.max_attempts:
+                    requeue.insert(0, lost)
+                else:
+                    self._remaining.discard(lost)
+                    self._emit({"test_name": lost, "passed": False, "duration": 0.0,
+                                "error": f"lost {self._attempts[lost]} times; "
+                                         f"last on {worker_id} ({reason})",
+                                "worker": worker_id})
+                    if not self._remaining:
+                        self._done.set()
+            if requeue:
+                self._pending.appendleft(requeue)
+
+    def fail_remaining(self, reason: str):
+        """Report every test still without a result as failed and finish the run."""
+        with self._lock:
+            for test_id in self._test_ids:
+                if test_id in self._remaining:
+                    self._remaining.discard(test_id)
+                    self._emit({"test_name": test_id, "passed": False, "duration": 0.0,
+                                "error": f"not run: {reason}", "worker": None})
+            self._pending.clear()
+            for state in self._workers.values():
+                state.queue.clear()
+            self._done.set()
+
+    def reap(self, now: Optional[float] = None):
+        """Drop workers that went silent or overran their lease."""
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            for state in list(self._workers.values()):
+                if now - state.last_seen > self.heartbeat_timeout:
+                    self.drop_worker(state.worker_id, "heartbeat timeout")
+                elif state.lease is not None and now > state.lease_deadline:
+                    self.drop_worker(state.worker_id, "lease timeout")
+
+    def _emit(self, result: Dict):
+        """Deliver a result to the results list, report and callback."""
+        self.results.append(result)
+        if self.report is not None:
+            self.report.add_test_result(result["test_name"], result["passed"],
+                                        result["duration"], result["error"],
+                                        resources=result.get("resources"))
+        if self.on_result is not None:
+            self.on_result(result)
+
+    # -- serving ----------------------------------------------------------
+
+    def start(self):
+        """Start listening and reaping in background threads."""
+        self._server = _Server((self.host, self.port), _Handler)
+        self._server.coordinator = self
+        self.host, self.port = self._server.server_address[:2]
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        threading.Thread(target=self._reap_loop, daemon=True).start()
+
+    def _reap_loop(self):
+        interval = min(self.heartbeat_timeout, self.lease_timeout) / 4
+        while not self._stopping.wait(interval):
+            self.reap()
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Block until every test has a result; False on timeout."""
+        return self._done.wait(timeout)
+
+    def stop(self):
+        """Stop serving and disconnect any remaining workers."""
+        self._stopping.set()
+        with self._lock:
+            for worker_id in list(self._workers):
+                self.drop_worker(worker_id, "coordinator stopped")
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+
+
+class Worker:
+    """Connects to a coordinator and runs leased tests one at a time."""
+
+    def __init__(self, address: Tuple[str, int], root: str = ".",
+                 worker_id: Optional[str] = None, heartbeat_interval: float = 2.0):
+        """
+        Initialize the worker.
+
+        Args:
+            address: Coordinator host and port.
+            root: Project root; it is put on ``sys.path`` so test IDs import.
+            worker_id: Unique name; defaults to ``<hostname>-<pid>``.
+            heartbeat_interval: Seconds between heartbeats.
+        """
+        self.address = address
+        self.root = str(Path(root).resolve())
+        self.worker_id = worker_id or f"{socket.gethostname()}-{os.getpid()}"
+        self.heartbeat_interval = heartbeat_interval
+        self.loader = unittest.TestLoader()
+        # One result across leases carries unittest's fixture bookkeeping.
+        self._result = StreamingResult(lambda record: None)
+
+    def run_test(self, test_id: str, last_in_class: bool = True) -> List[Dict]:
+        """
+        Run one test by ID and return its result records.
+
+        The class and module fixtures stay set up after the test unless
+        ``last_in_class`` is true, so the next lease of the same class
+        reuses them. Teardown errors are returned under their own names
+        (e.g. ``tearDownClass (module.Class)``).
+        """
+        try:
+            suite = self.loader.loadTestsFromName(test_id)
+        except Exception:
+            return [{"test_name": test_id, "passed": False, "duration": 0.0,
+                     "error": traceback.format_exc()}]
+        records: List[Dict] = []
+        self._result.emit = records.append
+        # Not a top-level run: the suite tears down a previous class (and
+        # module) only when this test belongs elsewhere, and leaves this
+        # test's fixtures up for the next lease.
+        self._result._testRunEntered = True
+        suite.run(self._result)
+        ran = [r for r in records if not r["test_name"].startswith(_TEARDOWN_HOOKS)]
+        if not ran:
+            error = "test produced no result"
+            owner = next((type(case) for case in _iter_cases(suite)), None)
+            if (getattr(owner, "_classSetupFailed", False)
+                    or getattr(self._result, "_moduleSetUpFailed", False)):
+                error = "not run: class or module setup failed earlier on this worker"
+            records.append({"test_name": test_id, "passed": False, "duration": 0.0,
+                            "error": error})
+        for record in ran:
+            # Import failures (_FailedTest) and setUpClass/setUpModule errors
+            # (_ErrorHolder) carry their own names; report them under the lease.
+            if record["test_name"] != test_id:
+                record["error"] = f"{record['test_name']}: {record['error']}"
+                record["test_name"] = test_id
+        if last_in_class:
+            records.extend(self.release_fixtures())
+        return records
+
+    def release_fixtures(self) -> List[Dict]:
+        """Tear down fixtures left up by earlier leases; return teardown error records."""
+        if getattr(self._result, "_previousTestClass", None) is None:
+            return []
+        records: List[Dict] = []
+        self._result.emit = records.append
+        # An empty top-level run tears down the previous class and module.
+        self._result._testRunEntered = False
+        unittest.TestSuite().run(self._result)
+        self._result._previousTestClass = None
+        return records
+
+    def run(self) -> int:
+        """Process leases until the coordinator shuts down; return tests run."""
+        if self.root not in sys.path:
+            sys.path.insert(0, self.root)
+        sock = socket.create_connection(self.address)
+        reader, writer = sock.makefile("rb"), sock.makefile("wb")
+        lock = threading.Lock()
+        stop = threading.Event()
+
+        def beat():
+            while not stop.wait(self.heartbeat_interval):
+                try:
+                    _send(writer, lock, {"type": "heartbeat"})
+                except OSError:
+                    return
+
+        threading.Thread(target=beat, daemon=True).start()
+        ran = 0
+        try:
+            _send(writer, lock, {"type": "hello", "worker": self.worker_id})
+            _send(writer, lock, {"type": "next"})
+            for line in reader:
+                message = json.loads(line)
+                if message["type"] == "shutdown":
+                    break
+                if message["type"] == "wait":
+                    time.sleep(message["delay"])
+                    _send(writer, lock, {"type": "next"})
+                    continue
+                test_id = message["test_id"]
+                records = self.run_test(test_id, message.get("last_in_class", True))
+                ran += 1
+                _send(writer, lock, {"type": "result", "test_id": test_id,
+                                     "records": records})
+        except OSError:
+            pass  # coordinator went away
+        finally:
+            stop.set()
+            sock.close()
+            # A fixture is only left up here if its tail was stolen; the
+            # run is over, so teardown errors can only be printed.
+            for record in self.release_fixtures():
+                print(f"{record['test_name']}: {record['error']}", file=sys.stderr)
+        return ran
+
+
+def spawn_worker(address: Tuple[str, int], root: str = ".",
+                 heartbeat_interval: float = 2.0,
+                 worker_id: Optional[str] = None) -> subprocess.Popen:
+    """Start one worker process on this machine."""
+    package_root = str(Path(__file__).resolve().parent.parent)
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [package_root, env.get("PYTHONPATH")]))
+    host, port = address
+    command = [sys.executable, "-m", "framework.distributed", "worker",
+               "--connect", f"{host}:{port}", "--root", root,
+               "--heartbeat-interval", str(heartbeat_interval)]
+    if worker_id is not None:
+        command += ["--worker-id", worker_id]
+    return subprocess.Popen(command, env=env)
+
+
+def spawn_local_workers(address: Tuple[str, int], count: int, root: str = ".",
+                        heartbeat_interval: float = 2.0) -> List[subprocess.Popen]:
+    """Start ``count`` worker processes on this machine."""
+    return [spawn_worker(address, root, heartbeat_interval) for _ in range(count)]
+
+
+def run_local_workers(coordinator: Coordinator, count: int, root: str = ".",
+                      heartbeat_interval: float = 2.0, timeout: Optional[float] = None,
+                      poll_interval: float = 0.2) -> bool:
+    """
+    Serve a started coordinator with ``count`` local workers until it finishes.
+
+    A worker process that exits while tests remain is restarted if it took
+    a lease since it was started; a crash inside a test uses up one of that
+    test's attempts, so restarts are bounded by ``max_attempts``. A worker
+    the coordinator dropped (for example for overrunning its lease) is
+    killed and restarted the same way. A worker that dies without taking a
+    lease is not restarted. Once no local worker
+    is running and no worker is registered, the remaining tests are failed
+    with "no workers left". The coordinator is stopped and the workers are
+    reaped before returning.
+
+    Returns:
+        True if every test has a result, False if ``timeout`` expired first.
+    """
+    deadline = None if timeout is None else time.monotonic() + timeout
+    hostname = socket.gethostname()
+    worker_ids = [f"{hostname}-local-{i}" for i in range(count)]
+    processes = [spawn_worker(coordinator.address, root, heartbeat_interval, worker_id)
+                 for worker_id in worker_ids]
+    leases_at_start = [0] * count
+
+    def dropped(i: int) -> bool:
+        # Took a lease since it started but is no longer registered, e.g.
+        # still stuck in a test after the coordinator dropped it.
+        return (coordinator.leases_granted(worker_ids[i]) > leases_at_start[i]
+                and not coordinator.has_worker(worker_ids[i]))
+
+    try:
+        while not coordinator.wait(poll_interval):
+            if deadline is not None and time.monotonic() > deadline:
+                return False
+            for i, process in enumerate(processes):
+                if process.poll() is None:
+                    if not dropped(i):
+                        continue
+                    process.kill()
+                    process.wait()
+                leases = coordinator.leases_granted(worker_ids[i])
+                if leases > leases_at_start[i]:
+                    leases_at_start[i] = leases
+                    processes[i] = spawn_worker(coordinator.address, root,
+                                                heartbeat_interval, worker_ids[i])
+            if (all(process.poll() is not None for process in processes)
+                    and not coordinator.worker_count):
+                coordinator.fail_remaining("no workers left")
+        return True
+    finally:
+        for i, process in enumerate(processes):
+            if process.poll() is None and dropped(i):
+                process.kill()
+        coordinator.stop()
+        for process in processes:
+            try:
+                process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                process.kill()
+                process.wait()
+
+
+def main(argv: Optional[Sequence[str]] = None):
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description="Distributed regression test runner")
+    sub = parser.add_subparsers(dest="role", required=True)
+    coord = sub.add_parser("coordinator", help="serve tests to workers")
+    coord.add_argument("--root", default=".")
+    coord.add_argument("--start-dir", default="tests")
+    coord.add_argument("--host", default="127.0.0.1")
+    coord.add_argument("--port", type=int, default=0)
+    coord.add_argument("--local-workers", type=int, default=0,
+                       help="also start this many workers on this machine")
+    coord.add_argument("--lease-timeout", type=float, default=600.0)
+    coord.add_argument("--heartbeat-timeout", type=float, default=10.0)
+    work = sub.add_parser("worker", help="run tests leased by a coordinator")
+    work.add_argument("--connect", required=True, help="coordinator HOST:PORT")
+    work.add_argument("--root", default=".")
+    work.add_argument("--heartbeat-interval", type=float, default=2.0)
+    work.add_argument("--worker-id", help="unique worker name (default HOST-PID)")
+    args = parser.parse_args(argv)
+
+    if args.role == "worker":
+        host, port = args.connect.rsplit(":", 1)
+        Worker((host, int(port)), args.root, worker_id=args.worker_id,
+               heartbeat_interval=args.heartbeat_interval).run()
+        return
+
+    def show(result: Dict):
+        status = "PASSED" if result["passed"] else "FAILED"
+        print(f"{status} {result['test_name']} [{result['worker']}]")
+        if result["error"] and not result["passed"]:
+            print(result["error"])
+
+    report = ReportGenerator()
+    coordinator = Coordinator(discover_test_ids(args.root, args.start_dir),
+                              args.host, args.port, report=report, on_result=show,
+                              lease_timeout=args.lease_timeout,
+                              heartbeat_timeout=args.heartbeat_timeout)
+    coordinator.start()
+    print(f"Coordinator listening on {coordinator.host}:{coordinator.port}", flush=True)
+    try:
+        if args.local_workers:
+            run_local_workers(coordinator, args.local_workers, args.root)
+        else:
+            coordinator.wait()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        coordinator.stop()
+        report.save_json_report()
+        report.save_html_report()
+
+
+if __name__ == "__main__":
+    main()
@@ -47,6 +47,19 @@ class TestFixtures:
             "timestamp": datetime.now().isoformat()
         }
 
+    @staticmethod
+    def get_sample_nmea_log() -> bytes:
+        """Get a short EMQuest receiver log of NMEA 0183 sentences."""
+        return (
+            b"$GPRMC,183000.00,A,3016.0320,N,09744.5860,W,0.02,0.0,150326,,,D*72\r\n"
+            b"$GPGGA,183000.00,3016.0320,N,09744.5860,W,4,12,0.9,250.5,M,-23.4,M,1.0,0001*7F\r\n"
+            b"$GPGSA,A,3,02,05,07,09,13,15,18,20,24,27,29,30,1.6,0.9,1.3*31\r\n"
+            b"$GPGSV,3,1,12,02,45,120,44,05,30,250,41,07,62,045,47,09,15,310,38*79\r\n"
+            b"$GPRMC,183001.00,A,3016.0321,N,09744.5861,W,0.03,0.0,150326,,,D*72\r\n"
+            b"$GPGGA,183001.00,3016.0321,N,09744.5861,W,5,11,1.1,250.7,M,-23.4,M,1.0,0001*77\r\n"
+            b"$GPGGA,183002.00,3016.0322,N,09744.5862,W,2,9,1.4,251.0,M,-23.4,M,,*67\r\n"
+        )
+
     @staticmethod
     def get_sample_spectra_python_integration() -> Dict[str, Any]:
         """Get sample Spectra Python integration test data."""
@@ -0,0 +1,116 @@
+"""
+Vectorized WGS-84 coordinate conversions and positional accuracy statistics.
+
+Fixes are converted from geodetic coordinates to ECEF and then to a local
+East-North-Up frame centred on a reference station, so RTK Fixed/Float and
+DGPS claims can be checked as positional error in metres. All functions
+operate on whole NumPy arrays.
+"""
+
+from typing import Any, Dict, Sequence, Tuple
+
+import numpy as np
+
+
+WGS84_A = 6378137.0
+WGS84_F = 1 / 298.257223563
+WGS84_E2 = WGS84_F * (2 - WGS84_F)
+
+
+def geodetic_to_ecef(latitude: np.ndarray, longitude: np.ndarray,
+                     altitude: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Convert WGS-84 latitude/longitude (degrees) and altitude (m) to ECEF (m)."""
+    lat = np.radians(np.asarray(latitude, dtype=np.float64))
+    lon = np.radians(np.asarray(longitude, dtype=np.float64))
+    alt = np.asarray(altitude, dtype=np.float64)
+    sin_lat, cos_lat = np.sin(lat), np.cos(lat)
+    n = WGS84_A / np.sqrt(1 - WGS84_E2 * sin_lat ** 2)
+    x = (n + alt) * cos_lat * np.cos(lon)
+    y = (n + alt) * cos_lat * np.sin(lon)
+    z = (n * (1 - WGS84_E2) + alt) * sin_lat
+    return x, y, z
+
+
+def ecef_to_enu(x: np.ndarray, y: np.ndarray, z: np.ndarray,
+                reference: Sequence[float]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Rotate ECEF positions into the ENU frame of ``reference``.
+
+    Args:
+        x, y, z: ECEF coordinates (m).
+        reference: (latitude, longitude, altitude) of the reference station.
+    """
+    ref_lat, ref_lon, ref_alt = reference
+    x0, y0, z0 = geodetic_to_ecef(ref_lat, ref_lon, ref_alt)
+    dx, dy, dz = np.asarray(x) - x0, np.asarray(y) - y0, np.asarray(z) - z0
+    lat, lon = np.radians(ref_lat), np.radians(ref_lon)
+    sin_lat, cos_lat = np.sin(lat), np.cos(lat)
+    sin_lon, cos_lon = np.sin(lon), np.cos(lon)
+    east = -sin_lon * dx + cos_lon * dy
+    north = -sin_lat * cos_lon * dx - sin_lat * sin_lon * dy + cos_lat * dz
+    up = cos_lat * cos_lon * dx + cos_lat * sin_lon * dy + sin_lat * dz
+    return east, north, up
+
+
+def geodetic_to_enu(latitude: np.ndarray, longitude: np.ndarray, altitude: np.ndarray,
+                    reference: Sequence[float]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Convert geodetic fixes directly to ENU relative to ``reference``."""
+    return ecef_to_enu(*geodetic_to_ecef(latitude, longitude, altitude), reference)
+
+
+def _grouped_quantile(values: np.ndarray, starts: np.ndarray, counts: np.ndarray,
+                      q: float) -> np.ndarray:
+    """Linear-interpolated quantile of each sorted group in ``values``."""
+    position = starts + q * (counts - 1)
+    lower = np.floor(position).astype(np.int64)
+    upper = np.minimum(lower + 1, starts + counts - 1)
+    weight = position - lower
+    return values[lower] * (1 - weight) + values[upper] * weight
+
+
+def accuracy_statistics(east: np.ndarray, north: np.ndarray, up: np.ndarray,
+                        fix_quality: np.ndarray) -> Dict[Any, Dict[str, float]]:
+    """
+    Compute positional error statistics per fix_quality class.
+
+    Errors are the ENU offsets from the reference (true) position. For each
+    class this reports horizontal and vertical RMS, 2DRMS, CEP (50th
+    percentile horizontal error) and R95 (95th percentile), plus the mean
+    ENU bias. Grouping, sums and percentiles are computed with array
+    operations over all fixes at once.
+    """
+    east = np.asarray(east, dtype=np.float64)
+    north = np.asarray(north, dtype=np.float64)
+    up = np.asarray(up, dtype=np.float64)
+    classes, group = np.unique(np.asarray(fix_quality), return_inverse=True)
+    group = group.ravel()
+    n_classes = len(classes)
+
+    horizontal_sq = east ** 2 + north ** 2
+    counts = np.bincount(group, minlength=n_classes)
+    h_rms = np.sqrt(np.bincount(group, horizontal_sq, n_classes) / counts)
+    v_rms = np.sqrt(np.bincount(group, up ** 2, n_classes) / counts)
+    bias = [np.bincount(group, axis, n_classes) / counts for axis in (east, north, up)]
+
+    # Sort horizontal errors within each class for percentile lookups.
+    horizontal = np.sqrt(horizontal_sq)
+    order = np.lexsort((horizontal, group))
+    sorted_errors = horizontal[order]
+    starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+    cep = _grouped_quantile(sorted_errors, starts, counts, 0.50)
+    r95 = _grouped_quantile(sorted_errors, starts, counts, 0.95)
+
+    stats = {}
+    for i, label in enumerate(classes.tolist()):
+        stats[label] = {
+            "count": int(counts[i]),
+            "horizontal_rms": float(h_rms[i]),
+            "vertical_rms": float(v_rms[i]),
+            "2drms": float(2 * h_rms[i]),
+            "cep": float(cep[i]),
+            "r95": float(r95[i]),
+            "bias_east": float(bias[0][i]),
+            "bias_north": float(bias[1][i]),
+            "bias_up": float(bias[2][i]),
+        }
+    return stats
@@ -0,0 +1,275 @@
+"""
+Batched constant-velocity Kalman filtering and RTS smoothing of GPS traces.
+
+Positions are local metric coordinates (e.g. ENU from geodetic_to_enu);
+each axis follows a constant-velocity model driven by white acceleration
+noise, and each fix's ``accuracy`` (1-sigma, metres) is its measurement
+noise. Because every axis sees the same times and noise, all axes share
+one 2x2 (position, velocity) covariance per sample.
+
+The recursions are evaluated as blocked associative scans (Sarkka and
+Garcia-Fernandez, "Temporal parallelization of Bayesian smoothers"): a
+trace is cut into about sqrt(T) chunks, each chunk is folded into one
+summary element, the summaries are scanned, and every chunk is then re-run
+from its exact starting state. Each step is one set of NumPy operations
+across all chunks of all traces, so a million-point drive needs a few
+thousand array operations instead of a million Python iterations, and the
+output matches the sequential filter to rounding error.
+"""
+
+import math
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+
+def _t(m: np.ndarray) -> np.ndarray:
+    """Transpose stacked matrices."""
+    return np.swapaxes(m, -1, -2)
+
+
+def _inv2(m: np.ndarray) -> np.ndarray:
+    """Closed-form inverse of stacked 2x2 matrices."""
+    a, b, c, d = m[..., 0, 0], m[..., 0, 1], m[..., 1, 0], m[..., 1, 1]
+    det = a * d - b * c
+    out = np.empty_like(m)
+    out[..., 0, 0] = d / det
+    out[..., 0, 1] = -b / det
+    out[..., 1, 0] = -c / det
+    out[..., 1, 1] = a / det
+    return out
+
+
+def _combine(first: Tuple, second: Tuple) -> Tuple:
+    """Associative combination of filtering elements (A, b, C, eta, J)."""
+    a1, b1, c1, e1, j1 = first
+    a2, b2, c2, e2, j2 = second
+    inv = _inv2(np.eye(2) + c1 @ j2)
+    a2_inv = a2 @ inv
+    # (I + J2 C1)^-1 is inv transposed because C and J are symmetric.
+    a1t_inv = _t(a1) @ _t(inv)
+    return (a2_inv @ a1,
+            a2_inv @ (b1 + c1 @ e2) + b2,
+            a2_inv @ c1 @ _t(a2) + c2,
+            a1t_inv @ (e2 - j2 @ b1) + e1,
+            a1t_inv @ j2 @ a1 + j1)
+
+
+def _advance(mean: np.ndarray, cov: np.ndarray, element: Tuple) -> Tuple[np.ndarray, np.ndarray]:
+    """Advance a filtered (mean, covariance) through one element."""
+    a, b, c, eta, j = element
+    gain = a @ _inv2(np.eye(2) + cov @ j)
+    new_mean = gain @ (mean + cov @ eta) + b
+    new_cov = gain @ cov @ _t(a) + c
+    return new_mean, 0.5 * (new_cov + _t(new_cov))
+
+
+def _chunks(array: np.ndarray, n: int, length: int) -> np.ndarray:
+    """Lay out (B, T', ...) step-major as (length, B, n, ...) for the scans."""
+    chunked = array.reshape(array.shape[:1] + (n, length) + array.shape[2:])
+    return np.ascontiguousarray(np.moveaxis(chunked, 2, 0))
+
+
+def _unchunk(array: np.ndarray) -> np.ndarray:
+    """Inverse of _chunks: (length, B, n, ...) back to (B, T', ...)."""
+    unchunked = np.moveaxis(array, 0, 2)
+    return unchunked.reshape(unchunked.shape[:1] + (-1,) + unchunked.shape[3:])
+
+
+def _prepare(times, positions, accuracy, chunk_size):
+    """Validate inputs, flatten batch dimensions and pad to whole chunks."""
+    times = np.asarray(times, dtype=np.float64)
+    positions = np.asarray(positions, dtype=np.float64)
+    accuracy = np.asarray(accuracy, dtype=np.float64)
+    if positions.ndim == times.ndim:
+        positions = positions[..., None]
+    if positions.shape[:-1] != times.shape or accuracy.shape != times.shape:
+        raise ValueError("times, positions and accuracy must share (..., T) dimensions")
+    batch_shape, samples = times.shape[:-1], times.shape[-1]
+    if samples == 0:
+        raise ValueError("traces must contain at least one sample")
+
+    times = times.reshape(-1, samples)
+    positions = positions.reshape(-1, samples, positions.shape[-1])
+    accuracy = accuracy.reshape(-1, samples)
+    valid = np.isfinite(accuracy) & np.isfinite(positions).all(axis=-1)
+    if not valid[:, 0].all():
+        raise ValueError("the first sample of every trace must be a valid fix")
+    if (accuracy[valid] <= 0).any():
+        raise ValueError("accuracy must be positive")
+    dt = np.diff(times, axis=-1, prepend=times[:, :1])
+    if (dt < 0).any() or not np.isfinite(dt).all():
+        raise ValueError("times must be finite and non-decreasing")
+
+    length = chunk_size or max(1, math.isqrt(samples))
+    n = -(-samples // length)
+    pad = n * length - samples
+    if pad:
+        # Zero-length steps without a fix are identity elements.
+        dt = np.pad(dt, ((0, 0), (0, pad)))
+        valid = np.pad(valid, ((0, 0), (0, pad)))
+        positions = np.pad(positions, ((0, 0), (0, pad), (0, 0)))
+        accuracy = np.pad(accuracy, ((0, 0), (0, pad)), constant_values=1.0)
+    return batch_shape, samples, n, length, dt, valid, positions, accuracy
+
+
+def _transition(dt: np.ndarray, process_noise: float) -> Tuple[np.ndarray, np.ndarray]:
+    """Constant-velocity transition F and process noise Q for each step."""
+    f = np.zeros(dt.shape + (2, 2))
+    f[..., 0, 0] = f[..., 1, 1] = 1.0
+    f[..., 0, 1] = dt
+    q = np.empty(dt.shape + (2, 2))
+    q[..., 0, 0] = process_noise * dt ** 3 / 3
+    q[..., 0, 1] = q[..., 1, 0] = process_noise * dt ** 2 / 2
+    q[..., 1, 1] = process_noise * dt
+    return f, q
+
+
+def _elements(valid, positions, accuracy, f, q, initial_velocity_std) -> Tuple:
+    """Filtering elements for every sample (position is the measured state)."""
+    y = np.where(valid[..., None], positions, 0.0)
+    weight = np.where(valid, 1.0 / (q[..., 0, 0] + accuracy ** 2), 0.0)
+    gain = q[..., :, 0] * weight[..., None]
+    residual = np.zeros_like(f)
+    residual[..., 0, 0] = 1.0 - gain[..., 0]
+    residual[..., 1, 0] = -gain[..., 1]
+    residual[..., 1, 1] = 1.0
+    h = f[..., 0, :]  # F^T H^T
+    a = residual @ f
+    b = gain[..., :, None] * y[..., None, :]
+    c = residual @ q
+    eta = h[..., :, None] * (y * weight[..., None])[..., None, :]
+    j = weight[..., None, None] * h[..., :, None] * h[..., None, :]
+
+    # The first sample initializes the state: position at the fix, velocity unknown.
+    a[:, 0] = 0.0
+    b[:, 0] = 0.0
+    b[:, 0, 0] = y[:, 0]
+    c[:, 0] = np.diag([0.0, initial_velocity_std ** 2])
+    c[:, 0, 0, 0] = accuracy[:, 0] ** 2
+    eta[:, 0] = 0.0
+    j[:, 0] = 0.0
+    return a, b, c, eta, j
+
+
+def _forward(times, positions, accuracy, process_noise, initial_velocity_std, chunk_size):
+    """Run the filter; return shapes, padded transitions and filtered states."""
+    batch_shape, samples, n, length, dt, valid, positions, accuracy = _prepare(
+        times, positions, accuracy, chunk_size)
+    f, q = _transition(dt, process_noise)
+    elements = _elements(valid, positions, accuracy, f, q, initial_velocity_std)
+    chunked = tuple(_chunks(part, n, length) for part in elements)
+    batch, axes = positions.shape[0], positions.shape[-1]
+
+    # Fold each chunk into one element, then scan the chunk summaries.
+    summary = tuple(part[0] for part in chunked)
+    for index in range(1, length):
+        summary = _combine(summary, tuple(part[index] for part in chunked))
+    start_mean = np.zeros((batch, n, 2, axes))
+    start_cov = np.zeros((batch, n, 2, 2))
+    mean, cov = np.zeros((batch, 2, axes)), np.zeros((batch, 2, 2))
+    for chunk in range(n):
+        start_mean[:, chunk], start_cov[:, chunk] = mean, cov
+        mean, cov = _advance(mean, cov, tuple(part[:, chunk] for part in summary))
+
+    # Re-run every chunk from its exact starting state.
+    means = np.empty((length, batch, n, 2, axes))
+    covs = np.empty((length, batch, n, 2, 2))
+    mean, cov = start_mean, start_cov
+    for index in range(length):
+        mean, cov = _advance(mean, cov, tuple(part[index] for part in chunked))
+        means[index], covs[index] = mean, cov
+    return batch_shape, samples, n, length, f, q, _unchunk(means), _unchunk(covs)
+
+
+def _output(batch_shape, samples, means, covs, single_axis) -> Dict[str, np.ndarray]:
+    """Trim padding and restore batch (and single-axis) dimensions."""
+    means, covs = means[:, :samples], covs[:, :samples]
+    axes = () if single_axis else means.shape[-1:]
+    return {
+        "position": means[..., 0, :].reshape(batch_shape + (samples,) + axes),
+        "velocity": means[..., 1, :].reshape(batch_shape + (samples,) + axes),
+        "covariance": covs.reshape(batch_shape + covs.shape[1:]),
+    }
+
+
+def kalman_filter(times: np.ndarray, positions: np.ndarray, accuracy: np.ndarray,
+                  process_noise: float = 1.0, initial_velocity_std: float = 10.0,
+                  chunk_size: Optional[int] = None) -> Dict[str, np.ndarray]:
+    """
+    Constant-velocity Kalman filter over one or many traces.
+
+    Args:
+        times: Sample times in seconds, shape (..., T); non-decreasing.
+        positions: Metric positions, shape (..., T, D) or (..., T) for one axis.
+        accuracy: 1-sigma horizontal accuracy (m) per fix, shape (..., T).
+            NaN accuracy or positions mark a missing fix (predict only).
+        process_noise: White acceleration spectral density (m^2/s^3).
+        initial_velocity_std: Prior velocity uncertainty (m/s) at the first fix.
+        chunk_size: Samples per scan chunk; defaults to about sqrt(T).
+
+    Returns:
+        ``position`` and ``velocity`` shaped like ``positions``, and the shared
+        per-axis (position, velocity) ``covariance`` of shape (..., T, 2, 2).
+
+    Raises:
+        ValueError: On mismatched shapes, decreasing times, a missing first
+            fix or non-positive accuracy.
+    """
+    batch_shape, samples, _, _, _, _, means, covs = _forward(
+        times, positions, accuracy, process_noise, initial_velocity_std, chunk_size)
+    return _output(batch_shape, samples, means, covs, np.ndim(positions) == np.ndim(times))
+
+
+def rts_smooth(times: np.ndarray, positions: np.ndarray, accuracy: np.ndarray,
+               process_noise: float = 1.0, initial_velocity_std: float = 10.0,
+               chunk_size: Optional[int] = None) -> Dict[str, np.ndarray]:
+    """
+    Rauch-Tung-Striebel smoothed positions, velocities and covariances.
+
+    Takes the same arguments and returns the same keys as kalman_filter,
+    but every sample is conditioned on the whole trace.
+    """
+    batch_shape, samples, n, length, f, q, means, covs = _forward(
+        times, positions, accuracy, process_noise, initial_velocity_std, chunk_size)
+
+    # The smoother is an affine backward recurrence:
+    #   m_s[k] = E[k] m_s[k+1] + g[k],  P_s[k] = E[k] P_s[k+1] E[k]^T + L[k]
+    f_next, q_next = f[:, 1:], q[:, 1:]
+    predicted = f_next @ covs[:, :-1] @ _t(f_next) + q_next
+    e = np.zeros_like(covs)
+    e[:, :-1] = covs[:, :-1] @ _t(f_next) @ _inv2(predicted)
+    e_f = e[:, :-1] @ f_next
+    g = means.copy()
+    g[:, :-1] -= e_f @ means[:, :-1]
+    lower = covs.copy()
+    lower[:, :-1] -= e_f @ covs[:, :-1]
+
+    # Fold each chunk backwards, scan the chunks, then re-run each chunk.
+    e, g, lower = (_chunks(part, n, length) for part in (e, g, lower))
+    acc_e, acc_g, acc_l = e[-1], g[-1], lower[-1]
+    for index in range(length - 2, -1, -1):
+        step_e = e[index]
+        acc_g = step_e @ acc_g + g[index]
+        acc_l = step_e @ acc_l @ _t(step_e) + lower[index]
+        acc_e = step_e @ acc_e
+    next_mean = np.zeros_like(acc_g)
+    next_cov = np.zeros_like(acc_l)
+    mean, cov = np.zeros_like(acc_g[:, 0]), np.zeros_like(acc_l[:, 0])
+    for chunk in range(n - 1, -1, -1):
+        next_mean[:, chunk], next_cov[:, chunk] = mean, cov
+        step_e = acc_e[:, chunk]
+        mean = step_e @ mean + acc_g[:, chunk]
+        cov = step_e @ cov @ _t(step_e) + acc_l[:, chunk]
+
+    smoothed_means = np.empty_like(g)
+    smoothed_covs = np.empty_like(lower)
+    mean, cov = next_mean, next_cov
+    for index in range(length - 1, -1, -1):
+        step_e = e[index]
+        mean = step_e @ mean + g[index]
+        cov = step_e @ cov @ _t(step_e) + lower[index]
+        cov = 0.5 * (cov + _t(cov))
+        smoothed_means[index], smoothed_covs[index] = mean, cov
+    return _output(batch_shape, samples, _unchunk(smoothed_means), _unchunk(smoothed_covs),
+                   np.ndim(positions) == np.ndim(times))
@@ -0,0 +1,281 @@
+"""
+Streaming health metrics for Aurora time series.
+
+Samples are ingested one at a time into time-based rolling windows that
+keep mean, max and an approximate quantile in O(1) per sample, and into
+breach trackers that measure how long a metric stays above its threshold.
+Vectorized helpers cover the same checks for whole recorded series, along
+with LTTB downsampling for plotting long series in the HTML report.
+"""
+
+import math
+from collections import deque
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+
+AURORA_METRICS = ["cpu_usage", "memory_usage", "network_latency", "uptime_seconds"]
+
+# (low, high) histogram range per metric for the quantile sketch.
+DEFAULT_RANGES = {
+    "cpu_usage": (0.0, 100.0),
+    "memory_usage": (0.0, 100.0),
+    "network_latency": (0.0, 1000.0),
+    "uptime_seconds": (0.0, 30 * 24 * 3600.0),
+}
+
+DEFAULT_THRESHOLDS = {
+    "cpu_usage": 90.0,
+    "memory_usage": 90.0,
+    "network_latency": 1000.0,
+}
+
+
+class RollingWindow:
+    """Time-based rolling window with O(1) mean, max and quantile sketch."""
+
+    def __init__(self, window_seconds: float, low: float = 0.0, high: float = 100.0,
+                 bins: int = 200):
+        """
+        Initialize the window.
+
+        Args:
+            window_seconds: Samples older than this (relative to the newest
+                sample) are evicted.
+            low: Lower bound of the quantile histogram range.
+            high: Upper bound of the quantile histogram range; values outside
+                [low, high] are clamped into the edge bins.
+            bins: Histogram resolution; quantile error is at most one bin width.
+        """
+        self.window_seconds = window_seconds
+        self.low = low
+        self.high = high
+        self.bins = bins
+        self._scale = bins / (high - low)
+        self._counts = [0] * bins
+        self._samples: deque = deque()
+        self._max_candidates: deque = deque()
+        self._sum = 0.0
+        self.skipped = 0
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+    def _bin(self, value: float) -> int:
+        """Map a value to its histogram bin."""
+        index = int((value - self.low) * self._scale)
+        return min(max(index, 0), self.bins - 1)
+
+    def push(self, timestamp: float, value: float):
+        """
+        Add a sample and evict samples that fell out of the window.
+
+        Non-finite values (missing readings) are counted in ``skipped`` and
+        otherwise ignored, so they cannot poison the sum or the max deque.
+        """
+        if not math.isfinite(value):
+            self.skipped += 1
+            return
+        cutoff = timestamp - self.window_seconds
+        samples = self._samples
+        while samples and samples[0][0] <= cutoff:
+            old_time, old_value, old_bin = samples.popleft()
+            self._sum -= old_value
+            self._counts[old_bin] -= 1
+            if self._max_candidates and self._max_candidates[0][0] == old_time:
+                self._max_candidates.popleft()
+
+        index = self._bin(value)
+        samples.append((timestamp, value, index))
+        self._sum += value
+        self._counts[index] += 1
+        # Monotonic deque: drop candidates that can never be the max again.
+        while self._max_candidates and self._max_candidates[-1][1] <= value:
+            self._max_candidates.pop()
+        self._max_candidates.append((timestamp, value))
+
+    @property
+    def mean(self) -> float:
+        """Mean of the samples currently in the window."""
+        return self._sum / len(self._samples) if self._samples else float("nan")
+
+    @property
+    def max(self) -> float:
+        """Maximum of the samples currently in the window."""
+        return self._max_candidates[0][1] if self._max_candidates else float("nan")
+
+    def quantile(self, q: float) -> float:
+        """Approximate ``q``-quantile from the window histogram (bin midpoint)."""
+        total = len(self._samples)
+        if not total:
+            return float("nan")
+        rank = q * (total - 1)
+        seen = 0
+        for index, count in enumerate(self._counts):
+            seen += count
+            if seen > rank:
+                return self.low + (index + 0.5) / self._scale
+        return self.high
+
+
+class BreachTracker:
+    """Tracks how long a metric stays above a threshold, in O(1) per sample."""
+
+    def __init__(self, threshold: float):
+        """Initialize the tracker for ``threshold`` (breach is value > threshold)."""
+        self.threshold = threshold
+        self.breach_start: Optional[float] = None
+        self.longest = 0.0
+        self.total = 0.0
+        self.count = 0
+        self._last_time: Optional[float] = None
+
+    def push(self, timestamp: float, value: float):
+        """Update breach state with a sample."""
+        if self.breach_start is not None:
+            self.total += timestamp - self._last_time
+        self._last_time = timestamp
+        if value > self.threshold:
+            if self.breach_start is None:
+                self.breach_start = timestamp
+                self.count += 1
+        elif self.breach_start is not None:
+            self.longest = max(self.longest, timestamp - self.breach_start)
+            self.breach_start = None
+
+    @property
+    def current(self) -> float:
+        """Duration of the ongoing breach, or 0 when within threshold."""
+        if self.breach_start is None:
+            return 0.0
+        return self._last_time - self.breach_start
+
+    @property
+    def longest_duration(self) -> float:
+        """Longest breach seen so far, including an ongoing one."""
+        return max(self.longest, self.current)
+
+
+class MetricsEngine:
+    """Streaming rolling-window health metrics for Aurora samples."""
+
+    def __init__(self, window_seconds: float = 300.0,
+                 thresholds: Optional[Dict[str, float]] = None,
+                 ranges: Optional[Dict[str, Tuple[float, float]]] = None,
+                 metrics: Optional[List[str]] = None, bins: int = 200):
+        """Initialize one rolling window (and optional breach tracker) per metric."""
+        self.thresholds = dict(DEFAULT_THRESHOLDS if thresholds is None else thresholds)
+        ranges = {**DEFAULT_RANGES, **(ranges or {})}
+        self.windows: Dict[str, RollingWindow] = {}
+        self.breaches: Dict[str, BreachTracker] = {}
+        for name in metrics or AURORA_METRICS:
+            low, high = ranges.get(name, (0.0, 100.0))
+            self.windows[name] = RollingWindow(window_seconds, low, high, bins)
+            if name in self.thresholds:
+                self.breaches[name] = BreachTracker(self.thresholds[name])
+        self.samples = 0
+
+    def ingest(self, timestamp: float, values: Dict[str, float]):
+        """Ingest one sample of metric values taken at ``timestamp`` (seconds)."""
+        for name, value in values.items():
+            window = self.windows.get(name)
+            if window is None:
+                continue
+            window.push(timestamp, value)
+            tracker = self.breaches.get(name)
+            if tracker is not None and math.isfinite(value):
+                tracker.push(timestamp, value)
+        self.samples += 1
+
+    def ingest_snapshot(self, aurora_data: Dict[str, Any], timestamp: float):
+        """Ingest an Aurora fixture-shaped snapshot (``metrics`` plus uptime)."""
+        values = dict(aurora_data["metrics"])
+        values["uptime_seconds"] = aurora_data["uptime_seconds"]
+        self.ingest(timestamp, values)
+
+    def summary(self, quantile: float = 0.95) -> Dict[str, Dict[str, float]]:
+        """Current rolling statistics and breach durations per metric."""
+        result = {}
+        for name, window in self.windows.items():
+            stats = {
+                "mean": window.mean,
+                "max": window.max,
+                f"p{int(quantile * 100)}": window.quantile(quantile),
+                "samples": len(window),
+                "skipped": window.skipped,
+            }
+            tracker = self.breaches.get(name)
+            if tracker is not None:
+                stats["threshold"] = tracker.threshold
+                stats["longest_breach"] = tracker.longest_duration
+                stats["total_breach"] = tracker.total
+                stats["breach_count"] = tracker.count
+            result[name] = stats
+        return result
+
+
+def breach_intervals(times: np.ndarray, values: np.ndarray,
+                     threshold: float) -> np.ndarray:
+    """
+    Find contiguous runs of samples above ``threshold``.
+
+    Returns an (n, 2) array of (start_time, end_time) per breach, where a
+    breach lasts from its first breaching sample to the first sample back
+    within threshold (or the last sample if it never recovers), matching
+    BreachTracker.
+    """
+    times = np.asarray(times, dtype=np.float64)
+    above = np.asarray(values) > threshold
+    if not len(above):
+        return np.empty((0, 2))
+    edges = np.diff(above.astype(np.int8), prepend=0, append=0)
+    starts = np.flatnonzero(edges == 1)
+    ends = np.minimum(np.flatnonzero(edges == -1), len(times) - 1)
+    return np.column_stack((times[starts], times[ends]))
+
+
+def max_breach_duration(times: np.ndarray, values: np.ndarray, threshold: float) -> float:
+    """Longest time spent continuously above ``threshold``."""
+    intervals = breach_intervals(times, values, threshold)
+    if not len(intervals):
+        return 0.0
+    return float((intervals[:, 1] - intervals[:, 0]).max())
+
+
+def lttb_downsample(times: np.ndarray, values: np.ndarray,
+                    n_out: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Downsample a series to ``n_out`` points with Largest-Triangle-Three-Buckets.
+
+    Keeps the first and last points and, from each bucket in between, the
+    point forming the largest triangle with the previously kept point and
+    the next bucket's average, which preserves visual peaks and dips.
+    """
+    times = np.asarray(times, dtype=np.float64)
+    values = np.asarray(values, dtype=np.float64)
+    n = len(times)
+    if n_out >= n or n_out < 3:
+        return times, values
+
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    # Bucket averages are used as the third triangle vertex.
+    t_cum = np.concatenate(([0.0], np.cumsum(times)))
+    v_cum = np.concatenate(([0.0], np.cumsum(values)))
+    counts = np.diff(edges)
+    avg_t = (t_cum[edges[1:]] - t_cum[edges[:-1]]) / counts
+    avg_v = (v_cum[edges[1:]] - v_cum[edges[:-1]]) / counts
+    avg_t = np.append(avg_t, times[-1])
+    avg_v = np.append(avg_v, values[-1])
+
+    selected = np.empty(n_out, dtype=np.int64)
+    selected[0], selected[-1] = 0, n - 1
+    previous = 0
+    for bucket in range(n_out - 2):
+        lo, hi = edges[bucket], edges[bucket + 1]
+        t, v = times[lo:hi], values[lo:hi]
+        area = np.abs((times[previous] - avg_t[bucket + 1]) * (v - values[previous])
+                      - (times[previous] - t) * (avg_v[bucket + 1] - values[previous]))
+        previous = lo + int(np.argmax(area))
+        selected[bucket + 1] = previous
+    return times[selected], values[selected]
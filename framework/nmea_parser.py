@@ -0,0 +1,410 @@
+"""
+Streaming NMEA 0183 parser for driving GPS regression tests from receiver logs.
+
+Logs are read in large chunks and processed as NumPy byte arrays: line
+splitting, checksum validation, sentence classification and numeric field
+decoding all happen in bulk, and each supported sentence type (GGA, RMC,
+GSA, GSV) is emitted as a columnar batch of arrays rather than one object
+per sentence.
+"""
+
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Union
+
+import numpy as np
+
+from .timestamps import days_from_civil
+
+
+# GGA quality indicator -> fixture ``fix_quality`` label.
+FIX_QUALITY_LABELS = np.array([
+    "Invalid", "GPS", "DGPS", "PPS", "RTK Fixed",
+    "RTK Float", "Estimated", "Manual", "Simulation", "Unknown",
+])
+
+SENTENCE_TYPES = ("GGA", "RMC", "GSA", "GSV")
+
+_HEX_VALUES = np.full(256, -1, dtype=np.int16)
+for _i, _c in enumerate(b"0123456789ABCDEF"):
+    _HEX_VALUES[_c] = _i
+for _i, _c in enumerate(b"abcdef"):
+    _HEX_VALUES[_c] = 10 + _i
+
+_TYPE_CODES = {
+    name: (ord(name[0]) << 16) | (ord(name[1]) << 8) | ord(name[2])
+    for name in SENTENCE_TYPES
+}
+
+Batch = Dict[str, Dict[str, np.ndarray]]
+
+
+def nmea_checksum(body: Union[str, bytes]) -> int:
+    """Compute the XOR checksum of a sentence body (between '$' and '*')."""
+    if isinstance(body, str):
+        body = body.encode("ascii")
+    return int(np.bitwise_xor.reduce(np.frombuffer(body, dtype=np.uint8))) if body else 0
+
+
+_POW10 = 10.0 ** np.arange(19)
+_MAX_FIELD_WIDTH = 18
+
+
+class _FieldTable:
+    """Field boundaries for a group of sentences sharing one field count."""
+
+    def __init__(self, buf: np.ndarray, starts: np.ndarray, ends: np.ndarray):
+        self.buf = buf
+        self.starts = starts
+        self.ends = ends
+        self.n_fields = starts.shape[1]
+        self._numbers: Dict[int, np.ndarray] = {}
+
+    def __len__(self) -> int:
+        return self.starts.shape[0]
+
+    def char(self, k: int) -> np.ndarray:
+        """Return the first byte of field ``k`` (0 when empty)."""
+        return np.where(self.present(k), self.buf[self.starts[:, k]], 0)
+
+    def present(self, k) -> np.ndarray:
+        """Return True where field(s) ``k`` are non-empty."""
+        return self.ends[:, k] > self.starts[:, k]
+
+    def parse_numbers(self, columns: List[int]):
+        """
+        Parse several numeric fields in one pass and cache the results.
+
+        All requested fields are decoded together with Horner's rule, one
+        character offset at a time, so each sentence type needs a single
+        pass however many numbers it carries.
+        """
+        columns = [k for k in dict.fromkeys(columns) if k not in self._numbers]
+        if not columns:
+            return
+        # (fields, sentences) layout, widest fields first, so each offset
+        # only touches the leading fields that are still that wide.
+        starts = self.starts[:, columns].T
+        lengths = self.ends[:, columns].T - starts
+        widths = np.minimum(lengths.max(axis=1, initial=0), _MAX_FIELD_WIDTH)
+        order = np.argsort(-widths, kind="stable")
+        starts, lengths, widths = starts[order], lengths[order], widths[order]
+        mantissa = np.zeros(starts.shape)
+        fraction = np.zeros(starts.shape, dtype=np.int64)
+        seen_dot = np.zeros(starts.shape, dtype=bool)
+        has_digit = np.zeros(starts.shape, dtype=bool)
+        last = len(self.buf) - 1
+        for offset in range(int(widths.max(initial=0))):
+            m = int(np.count_nonzero(widths > offset))
+            chars = self.buf[np.minimum(starts[:m] + offset, last)]
+            inside = offset < lengths[:m]
+            digit = chars - np.uint8(48)
+            is_digit = (digit <= 9) & inside
+            mantissa[:m] = np.where(is_digit, mantissa[:m] * 10 + digit, mantissa[:m])
+            fraction[:m] += is_digit & seen_dot[:m]
+            seen_dot[:m] |= (chars == 46) & inside
+            has_digit[:m] |= is_digit
+        values = mantissa / _POW10[fraction]
+        values = np.where(self.buf[np.minimum(starts, last)] == 45, -values, values)
+        values = np.where(has_digit, values, np.nan)
+        for row, index in enumerate(order):
+            self._numbers[columns[index]] = values[row]
+
+    def number(self, k) -> np.ndarray:
+        """Parse field(s) ``k`` as decimal numbers; empty fields become NaN."""
+        columns = list(range(self.n_fields)[k]) if isinstance(k, slice) else [k]
+        self.parse_numbers(columns)
+        if isinstance(k, slice):
+            return np.stack([self._numbers[c] for c in columns], axis=1)
+        return self._numbers[k]
+
+    def integer(self, k, default: int = 0) -> np.ndarray:
+        """Parse field(s) ``k`` as integers; empty fields become ``default``."""
+        values = self.number(k)
+        return np.where(np.isnan(values), default, values).astype(np.int64)
+
+
+def _to_degrees(value: np.ndarray, hemisphere: np.ndarray, negative: int) -> np.ndarray:
+    """Convert NMEA ``(d)ddmm.mmmm`` values to signed decimal degrees."""
+    degrees = np.floor(value / 100.0)
+    decimal = degrees + (value - degrees * 100.0) / 60.0
+    return np.where(hemisphere == negative, -decimal, decimal)
+
+
+def _time_of_day(value: np.ndarray) -> np.ndarray:
+    """Convert NMEA ``hhmmss.ss`` values to seconds since midnight."""
+    hours = np.floor(value / 10000.0)
+    minutes = np.floor(value / 100.0) % 100.0
+    return hours * 3600.0 + minutes * 60.0 + value % 100.0
+
+
+def _concat(parts: List[Dict[str, np.ndarray]], order: List[np.ndarray]) -> Dict[str, np.ndarray]:
+    """Concatenate per-shape column groups and restore original line order."""
+    if len(parts) == 1:
+        return parts[0]
+    index = np.argsort(np.concatenate(order), kind="stable")
+    return {key: np.concatenate([p[key] for p in parts])[index] for key in parts[0]}
+
+
+class NMEAStreamParser:
+    """Chunked NMEA 0183 parser producing columnar fix batches."""
+
+    def __init__(self, chunk_size: int = 1024 * 1024, uere: float = 5.0):
+        """
+        Initialize the parser.
+
+        Args:
+            chunk_size: Bytes decoded per chunk; about 1 MiB keeps the
+                working arrays cache-resident and is fastest in practice.
+            uere: User equivalent range error (m); GGA ``accuracy`` is
+                estimated as HDOP * UERE, matching the fixture field.
+        """
+        self.chunk_size = chunk_size
+        self.uere = uere
+        self.sentences = 0
+        self.checksum_errors = 0
+        self.malformed = 0
+        self._remainder = b""
+        self._last_date = -1
+
+    def parse_file(self, path: Union[str, Path]) -> Iterator[Batch]:
+        """Yield one batch per chunk of the log at ``path``."""
+        with open(path, "rb") as f:
+            while True:
+                chunk = f.read(self.chunk_size)
+                if not chunk:
+                    break
+                batch = self.feed(chunk)
+                if batch:
+                    yield batch
+        batch = self.flush()
+        if batch:
+            yield batch
+
+    def parse_bytes(self, data: bytes) -> Batch:
+        """Parse a complete in-memory log and return a single batch."""
+        batches = [self.feed(data[i:i + self.chunk_size])
+                   for i in range(0, len(data), self.chunk_size)]
+        batches.append(self.flush())
+        batch: Batch = {}
+        for kind in SENTENCE_TYPES:
+            parts = [b[kind] for b in batches if kind in b]
+            if parts:
+                batch[kind] = {k: np.concatenate([p[k] for p in parts]) for k in parts[0]}
+        return batch
+
+    def feed(self, data: bytes) -> Batch:
+        """Parse all complete lines in ``data``; partial lines are carried over."""
+        data = self._remainder + data
+        cut = data.rfind(b"\n") + 1
+        self._remainder = data[cut:]
+        return self._parse_lines(data[:cut]) if cut else {}
+
+    def flush(self) -> Batch:
+        """Parse any trailing line that was not newline-terminated."""
+        data, self._remainder = self._remainder, b""
+        return self._parse_lines(data + b"\n") if data.strip() else {}
+
+    def _parse_lines(self, data: bytes) -> Batch:
+        """Validate and decode a buffer of complete newline-terminated lines."""
+        buf = np.frombuffer(data, dtype=np.uint8)
+        ends = np.flatnonzero(buf == 10)
+        starts = np.empty_like(ends)
+        starts[0] = 0
+        starts[1:] = ends[:-1] + 1
+        ends = ends - (buf[np.maximum(ends - 1, 0)] == 13)
+
+        nonblank = ends > starts
+        starts, ends = starts[nonblank], ends[nonblank]
+        if len(starts) == 0:
+            return {}
+        self.sentences += len(starts)
+
+        # Locate the single '*' of each line and count commas per line.
+        stars = np.flatnonzero(buf == 42)
+        star_line = np.searchsorted(ends, stars)
+        in_line = (star_line < len(ends)) & (stars >= starts[np.minimum(star_line, len(ends) - 1)])
+        stars, star_line = stars[in_line], star_line[in_line]
+        star_count = np.bincount(star_line, minlength=len(starts))
+        star_pos = np.full(len(starts), -1, dtype=np.int64)
+        star_pos[star_line] = stars
+
+        comma_idx = np.flatnonzero(buf == 44)
+        first_comma = np.searchsorted(comma_idx, starts)
+        commas = np.searchsorted(comma_idx, ends) - first_comma
+
+        shaped = ((buf[starts] == 36) & (star_count == 1)
+                  & (ends - star_pos == 3) & (star_pos - starts >= 7))
+        self.malformed += int(np.count_nonzero(~shaped))
+        idx = np.flatnonzero(shaped)
+        starts, star_pos, commas = starts[idx], star_pos[idx], commas[idx]
+        first_comma = first_comma[idx]
+
+        # Bulk checksum: XOR-reduce each [start+1, star) segment.
+        bounds = np.empty(2 * len(starts), dtype=np.int64)
+        bounds[0::2] = starts + 1
+        bounds[1::2] = star_pos
+        computed = np.bitwise_xor.reduceat(buf, bounds)[0::2] if len(bounds) else bounds
+        high, low = _HEX_VALUES[buf[star_pos + 1]], _HEX_VALUES[buf[star_pos + 2]]
+        valid = (high >= 0) & (low >= 0) & (computed == high * 16 + low)
+        self.checksum_errors += int(np.count_nonzero(~valid))
+        starts, star_pos, commas = starts[valid], star_pos[valid], commas[valid]
+        first_comma = first_comma[valid]
+        # A sentence type is only recognized when its address field is 5 chars.
+        if len(comma_idx):
+            addressed = comma_idx[np.minimum(first_comma, len(comma_idx) - 1)] == starts + 6
+        else:
+            addressed = np.zeros(len(starts), dtype=bool)
+        commas = np.where(addressed & (commas > 0), commas, 0)
+
+        def fields(group: np.ndarray) -> _FieldTable:
+            n_fields = int(commas[group[0]])
+            comma = comma_idx[first_comma[group][:, None] + np.arange(n_fields)]
+            field_ends = np.empty_like(comma)
+            field_ends[:, :-1] = comma[:, 1:]
+            field_ends[:, -1] = star_pos[group]
+            return _FieldTable(buf, comma + 1, field_ends)
+
+        type_code = ((buf[starts + 3].astype(np.int64) << 16)
+                     | (buf[starts + 4].astype(np.int64) << 8)
+                     | buf[starts + 5])
+        order = np.arange(len(starts))
+
+        batch: Batch = {}
+        dates = self._forward_fill_dates(fields, commas, type_code, order)
+        for name in SENTENCE_TYPES:
+            sel = type_code == _TYPE_CODES[name]
+            if not np.any(sel):
+                continue
+            parts, part_order = [], []
+            for n_commas in np.unique(commas[sel]):
+                if n_commas == 0:
+                    continue
+                group = np.flatnonzero(sel & (commas == n_commas))
+                columns = self._decode(name, fields(group), dates[group])
+                if columns is not None:
+                    parts.append(columns)
+                    part_order.append(order[group])
+            if parts:
+                batch[name] = _concat(parts, part_order)
+        return batch
+
+    def _forward_fill_dates(self, fields: Callable[[np.ndarray], _FieldTable],
+                            commas: np.ndarray, type_code: np.ndarray,
+                            order: np.ndarray) -> np.ndarray:
+        """Assign each line the epoch day of the most recent preceding RMC."""
+        dates = np.full(len(order), -1, dtype=np.int64)
+        is_rmc = (type_code == _TYPE_CODES["RMC"]) & (commas >= 11)
+        for n_commas in np.unique(commas[is_rmc]):
+            rmc = np.flatnonzero(is_rmc & (commas == n_commas))
+            ddmmyy = fields(rmc).integer(8, default=-1)
+            known = ddmmyy >= 0
+            day, month, year = ddmmyy // 10000, (ddmmyy // 100) % 100, ddmmyy % 100
+            days = days_from_civil(2000 + year, month, day)
+            dates[rmc[known]] = days[known]
+        has_date = dates >= 0
+        last = np.maximum.accumulate(np.where(has_date, order, -1)) if len(order) else order
+        filled = np.where(last >= 0, dates[np.maximum(last, 0)], self._last_date)
+        if len(filled):
+            self._last_date = int(filled[-1])
+        return filled
+
+    def _decode(self, name: str, fields: _FieldTable, dates: np.ndarray
+                ) -> Optional[Dict[str, np.ndarray]]:
+        """Decode a field table for one sentence type into named columns."""
+        n_fields = fields.n_fields
+        day_seconds = np.where(dates >= 0, dates * 86400.0, np.nan)
+
+        if name == "GGA":
+            if n_fields < 14:
+                return None
+            fields.parse_numbers([0, 1, 3, 5, 6, 7, 8, 10])
+            utc_time = _time_of_day(fields.number(0))
+            quality = np.clip(fields.integer(5), 0, len(FIX_QUALITY_LABELS) - 1)
+            hdop = fields.number(7)
+            return {
+                "timestamp": day_seconds + utc_time,
+                "utc_time": utc_time,
+                "latitude": _to_degrees(fields.number(1), fields.char(2), ord("S")),
+                "longitude": _to_degrees(fields.number(3), fields.char(4), ord("W")),
+                "altitude": fields.number(8),
+                "geoid_separation": fields.number(10),
+                "hdop": hdop,
+                "accuracy": hdop * self.uere,
+                "satellites": fields.integer(6),
+                "quality_code": quality,
+                "fix_quality": FIX_QUALITY_LABELS[quality],
+            }
+
+        if name == "RMC":
+            if n_fields < 11:
+                return None
+            fields.parse_numbers([0, 2, 4, 6, 7])
+            utc_time = _time_of_day(fields.number(0))
+            return {
+                "timestamp": day_seconds + utc_time,
+                "utc_time": utc_time,
+                "valid": fields.char(1) == ord("A"),
+                "latitude": _to_degrees(fields.number(2), fields.char(3), ord("S")),
+                "longitude": _to_degrees(fields.number(4), fields.char(5), ord("W")),
+                "speed_knots": fields.number(6),
+                "course": fields.number(7),
+            }
+
+        if name == "GSA":
+            if n_fields < 17:
+                return None
+            fields.parse_numbers([1, 14, 15, 16])
+            return {
+                "auto_mode": fields.char(0) == ord("A"),
+                "fix_type": fields.integer(1, default=1),
+                "satellites_used": np.count_nonzero(fields.present(slice(2, 14)), axis=1),
+                "pdop": fields.number(14),
+                "hdop": fields.number(15),
+                "vdop": fields.number(16),
+            }
+
+        # GSV: three header fields then up to four (prn, elev, az, snr) blocks.
+        blocks = (n_fields - 3) // 4
+        if n_fields < 3 or blocks > 4:
+            return None
+        fields.parse_numbers([0, 1, 2] + list(range(3, 3 + 4 * blocks, 4))
+                             + list(range(6, 6 + 4 * blocks, 4)))
+        columns = {
+            "total_messages": fields.integer(0),
+            "message_number": fields.integer(1),
+            "satellites_in_view": fields.integer(2),
+        }
+        columns["prn"] = np.full((len(fields), 4), -1, dtype=np.int64)
+        columns["snr"] = np.full((len(fields), 4), np.nan)
+        if blocks:
+            columns["prn"][:, :blocks] = fields.integer(slice(3, 3 + 4 * blocks, 4), default=-1)
+            columns["snr"][:, :blocks] = fields.number(slice(6, 6 + 4 * blocks, 4))
+        return columns
+
+
+def to_fixture_records(gga: Dict[str, np.ndarray], device_id: str = "EMQ_GPS_001",
+                       signal_strength: int = 85) -> List[Dict[str, Any]]:
+    """
+    Convert a GGA batch into dicts shaped like the EMQuest GPS fixture.
+
+    Intended for spot-checking a handful of fixes with the existing
+    assertions; large batches should be validated column-wise instead.
+    """
+    records = []
+    for i in range(len(gga["latitude"])):
+        timestamp = gga["timestamp"][i]
+        records.append({
+            "device_id": device_id,
+            "location": {
+                "latitude": float(gga["latitude"][i]),
+                "longitude": float(gga["longitude"][i]),
+                "accuracy": float(gga["accuracy"][i]),
+                "altitude": float(gga["altitude"][i]),
+            },
+            "signal_strength": signal_strength,
+            "satellites": int(gga["satellites"][i]),
+            "fix_quality": str(gga["fix_quality"][i]),
+            "timestamp": (np.datetime64(int(round(timestamp * 1e6)), "us").astype(str)
+                          if np.isfinite(timestamp) else ""),
+        })
+    return records
@@ -0,0 +1,110 @@
+"""
+Per-test resource profiling used by TestBase.
+
+Profiling is opt-in: set ``profile_resources = True`` on a TestBase
+subclass or export ``REGRESSION_PROFILE=1``. Cheap counters (CPU time,
+RSS, GC collections) are recorded for every profiled test; tracemalloc,
+which slows allocation-heavy code, only runs for a deterministic sample
+of tests: 10% by default, or ``REGRESSION_PROFILE_SAMPLE_RATE`` (set it
+to 1 to trace every test).
+"""
+
+import gc
+import os
+import time
+import tracemalloc
+import zlib
+from typing import Any, Dict, Optional
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+def profiling_enabled(default: bool = False) -> bool:
+    """Check whether profiling is switched on via ``REGRESSION_PROFILE``."""
+    value = os.environ.get("REGRESSION_PROFILE")
+    if value is None:
+        return default
+    return value.lower() not in ("", "0", "false", "no")
+
+
+# Fraction of profiled tests traced with tracemalloc unless overridden.
+DEFAULT_SAMPLE_RATE = 0.1
+
+
+def default_sample_rate() -> float:
+    """Fraction of profiled tests that also trace allocations."""
+    value = os.environ.get("REGRESSION_PROFILE_SAMPLE_RATE")
+    return DEFAULT_SAMPLE_RATE if value is None else float(value)
+
+
+def is_sampled(test_id: str, sample_rate: float) -> bool:
+    """Deterministically pick tests so the same ones are traced every run."""
+    if sample_rate >= 1.0:
+        return True
+    return zlib.crc32(test_id.encode()) / 0xFFFFFFFF < sample_rate
+
+
+def current_rss() -> Optional[int]:
+    """Resident set size of this process in bytes, if it can be read."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        pass
+    if resource is not None:
+        # ru_maxrss is a high-water mark (KiB on Linux, bytes on macOS).
+        rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return rss if os.uname().sysname == "Darwin" else rss * 1024
+    return None
+
+
+def _gc_collections() -> int:
+    """Total collections run so far across all GC generations."""
+    return sum(stats["collections"] for stats in gc.get_stats())
+
+
+class ResourceProfiler:
+    """Captures CPU time, peak allocation, RSS delta and GC counts for one test."""
+
+    def __init__(self, trace_allocations: bool = True):
+        """Initialize; ``trace_allocations`` enables tracemalloc for this run."""
+        self.trace_allocations = trace_allocations
+        self._owns_tracemalloc = False
+
+    def start(self):
+        """Begin measuring."""
+        if self.trace_allocations:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                self._owns_tracemalloc = True
+            tracemalloc.reset_peak()
+            self._traced_start = tracemalloc.get_traced_memory()[0]
+        self._rss_start = current_rss()
+        self._gc_start = _gc_collections()
+        self._cpu_start = time.process_time()
+        self._wall_start = time.perf_counter()
+
+    def stop(self) -> Dict[str, Any]:
+        """Stop measuring and return the resource profile."""
+        wall = time.perf_counter() - self._wall_start
+        cpu = time.process_time() - self._cpu_start
+        profile: Dict[str, Any] = {
+            "wall_time": wall,
+            "cpu_time": cpu,
+            "gc_collections": _gc_collections() - self._gc_start,
+            "rss_delta_bytes": None,
+            "peak_alloc_bytes": None,
+        }
+        rss = current_rss()
+        if rss is not None and self._rss_start is not None:
+            profile["rss_delta_bytes"] = rss - self._rss_start
+        if self.trace_allocations:
+            peak = tracemalloc.get_traced_memory()[1]
+            profile["peak_alloc_bytes"] = max(peak - self._traced_start, 0)
+            if self._owns_tracemalloc:
+                tracemalloc.stop()
+                self._owns_tracemalloc = False
+        return profile
@@ -4,9 +4,39 @@ Test report generation and analysis utilities.
 
 import json
 from datetime import datetime
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional, Sequence
 from pathlib import Path
 
+from .metrics_engine import lttb_downsample
+
+# (profile key, column heading, scale) for per-test resource columns.
+RESOURCE_COLUMNS = [
+    ("cpu_time", "CPU (s)", 1.0),
+    ("peak_alloc_bytes", "Peak Alloc (KiB)", 1 / 1024),
+    ("rss_delta_bytes", "RSS Delta (KiB)", 1 / 1024),
+    ("gc_collections", "GC Collections", 1.0),
+]
+
+_SORT_SCRIPT = """
+            <script>
+            function sortTable(th) {
+                const table = th.closest("table");
+                const index = Array.from(th.parentNode.children).indexOf(th);
+                const rows = Array.from(table.querySelectorAll("tr")).slice(1);
+                const asc = th.dataset.order !== "asc";
+                th.dataset.order = asc ? "asc" : "desc";
+                const key = r => {
+                    const cell = r.children[index];
+                    const v = cell.dataset.value;
+                    return v !== undefined ? parseFloat(v) : cell.textContent;
+                };
+                rows.sort((a, b) => (key(a) > key(b) ? 1 : key(a) < key(b) ? -1 : 0)
+                                    * (asc ? 1 : -1));
+                rows.forEach(r => table.appendChild(r));
+            }
+            </script>
+"""
+
 
 class ReportGenerator:
     """Generates test reports and metrics."""
@@ -16,10 +46,13 @@ class ReportGenerator:
         self.output_dir = Path(output_dir)
         self.output_dir.mkdir(exist_ok=True)
         self.test_results: List[Dict[str, Any]] = []
+        self.time_series: Dict[str, Dict[str, Any]] = {}
+        self.sections: Dict[str, Dict[str, Any]] = {}
 
     def add_test_result(self, test_name: str, passed: bool, 
-                       duration: float, error: str = ""):
-        """Record a test result."""
+                       duration: float, error: str = "",
+                       resources: Optional[Dict[str, Any]] = None):
+        """Record a test result, optionally with its resource profile."""
         result = {
             "test_name": test_name,
             "passed": passed,
@@ -27,8 +60,39 @@ class ReportGenerator:
             "error": error,
             "timestamp": datetime.now().isoformat()
         }
+        if resources is not None:
+            result["resources"] = resources
         self.test_results.append(result)
 
+    def attach_resource_profiles(self, profiles: Dict[str, Dict[str, Any]]):
+        """Attach profiles (e.g. TestBase.resource_profiles) to results by test name."""
+        for result in self.test_results:
+            profile = profiles.get(result["test_name"])
+            if profile is not None:
+                result["resources"] = profile
+
+    def top_resource_users(self, key: str, n: int = 10) -> List[Dict[str, Any]]:
+        """Return the ``n`` results with the highest ``key`` resource value."""
+        profiled = [r for r in self.test_results
+                    if r.get("resources", {}).get(key) is not None]
+        profiled.sort(key=lambda r: r["resources"][key], reverse=True)
+        return profiled[:n]
+
+    def add_time_series(self, name: str, times: Sequence[float],
+                        values: Sequence[float], max_points: int = 500,
+                        threshold: Optional[float] = None):
+        """Record a metric series, LTTB-downsampled to ``max_points`` for plotting."""
+        times, values = lttb_downsample(times, values, max_points)
+        self.time_series[name] = {
+            "times": times.tolist(),
+            "values": values.tolist(),
+            "threshold": threshold,
+        }
+
+    def add_section(self, title: str, data: Dict[str, Any]):
+        """Record a named key/value summary (e.g. timestamp checks) for the report."""
+        self.sections[title] = data
+
     def generate_summary(self) -> Dict[str, Any]:
         """Generate test summary."""
         total = len(self.test_results)
@@ -49,7 +113,9 @@ class ReportGenerator:
         """Save report as JSON."""
         report = {
             "summary": self.generate_summary(),
-            "results": self.test_results
+            "results": self.test_results,
+            "time_series": self.time_series,
+            "sections": self.sections
         }
         output_path = self.output_dir / filename
         with open(output_path, "w") as f:
@@ -96,9 +162,17 @@ class ReportGenerator:
             <h2>Test Results</h2>
             <table>
                 <tr>
-                    <th>Test Name</th>
-                    <th>Status</th>
-                    <th>Duration (s)</th>
+                    <th onclick="sortTable(this)">Test Name</th>
+                    <th onclick="sortTable(this)">Status</th>
+                    <th onclick="sortTable(this)">Duration (s)</th>
+        """
+        profiled = any("resources" in r for r in self.test_results)
+        if profiled:
+            for _, heading, _ in RESOURCE_COLUMNS:
+                html += f"""
+                    <th onclick="sortTable(this)">{heading}</th>
+                """
+        html += """
                 </tr>
         """
         for result in self.test_results:
@@ -108,12 +182,100 @@ class ReportGenerator:
                 <tr>
                     <td>{result["test_name"]}</td>
                     <td class="{status_class}">{status}</td>
-                    <td>{result["duration"]:.3f}</td>
+                    <td data-value="{result["duration"]}">{result["duration"]:.3f}</td>
+            """
+            if profiled:
+                html += self._resource_cells(result.get("resources", {}))
+            html += """
                 </tr>
             """
         html += """
             </table>
+        """
+        if profiled:
+            html += self._top_resource_tables()
+        html += _SORT_SCRIPT
+        for title, data in self.sections.items():
+            html += f"""
+            <h2>{title}</h2>
+            <table>
+                <tr><th>Metric</th><th>Value</th></tr>
+            """
+            for key, value in data.items():
+                html += f"""
+                <tr><td>{key}</td><td>{value}</td></tr>
+                """
+            html += """
+            </table>
+            """
+        for name, series in self.time_series.items():
+            html += f"""
+            <h2>{name}</h2>
+            {self._generate_svg(series)}
+            """
+        html += """
         </body>
         </html>
         """
         return html
+
+    def _resource_cells(self, resources: Dict[str, Any]) -> str:
+        """Render resource profile cells for one result row."""
+        cells = ""
+        for key, _, scale in RESOURCE_COLUMNS:
+            value = resources.get(key)
+            if value is None:
+                cells += """
+                    <td data-value="-1">-</td>
+                """
+            else:
+                cells += f"""
+                    <td data-value="{value}">{value * scale:.3f}</td>
+                """
+        return cells
+
+    def _top_resource_tables(self, n: int = 10) -> str:
+        """Render top-N tables for CPU time and peak allocation."""
+        html = ""
+        for key, heading, scale in RESOURCE_COLUMNS[:2]:
+            html += f"""
+            <h2>Top {n} by {heading}</h2>
+            <table>
+                <tr><th>Test Name</th><th>{heading}</th></tr>
+            """
+            for result in self.top_resource_users(key, n):
+                value = result["resources"][key] * scale
+                html += f"""
+                <tr><td>{result["test_name"]}</td><td>{value:.3f}</td></tr>
+                """
+            html += """
+            </table>
+            """
+        return html
+
+    def _generate_svg(self, series: Dict[str, Any], width: int = 800,
+                      height: int = 200) -> str:
+        """Render a recorded time series as an inline SVG line chart."""
+        times, values = series["times"], series["values"]
+        if not times:
+            return "<p>No samples</p>"
+        threshold = series["threshold"]
+        t0, t1 = min(times), max(times)
+        v_all = values + ([threshold] if threshold is not None else [])
+        v0, v1 = min(v_all), max(v_all)
+        t_span, v_span = (t1 - t0) or 1.0, (v1 - v0) or 1.0
+
+        def x(t):
+            return (t - t0) / t_span * width
+
+        def y(v):
+            return height - (v - v0) / v_span * height
+
+        points = " ".join(f"{x(t):.1f},{y(v):.1f}" for t, v in zip(times, values))
+        svg = (f'<svg width="{width}" height="{height}" '
+               f'style="border: 1px solid #ddd;">'
+               f'<polyline fill="none" stroke="#4CAF50" points="{points}"/>')
+        if threshold is not None:
+            svg += (f'<line x1="0" x2="{width}" y1="{y(threshold):.1f}" '
+                    f'y2="{y(threshold):.1f}" stroke="red" stroke-dasharray="4"/>')
+        return svg + "</svg>"
@@ -0,0 +1,57 @@
+"""
+Streaming unittest results shared by the watch daemon and distributed runner.
+
+StreamingResult turns each finished test into a plain record dict (the
+shape ReportGenerator.add_test_result takes) and hands it to a callback as
+soon as the test ends, so results can be forwarded over pipes or sockets.
+"""
+
+import time
+import unittest
+from typing import Callable, Dict
+
+
+class StreamingResult(unittest.TestResult):
+    """TestResult that emits one record per finished test."""
+
+    def __init__(self, emit: Callable[[Dict], None]):
+        super().__init__()
+        self.emit = emit
+        self._started = 0.0
+
+    def startTest(self, test):
+        super().startTest(test)
+        self._started = time.perf_counter()
+
+    def _record(self, test, passed: bool, error: str = ""):
+        if isinstance(test, unittest.TestCase):
+            name, duration = test.id(), time.perf_counter() - self._started
+        else:
+            # setUpClass/setUpModule failures arrive as an _ErrorHolder.
+            name, duration = test.description, 0.0
+        record = {
+            "test_name": name,
+            "passed": passed,
+            "duration": duration,
+            "error": error,
+        }
+        profile = getattr(test, "resource_profile", None)
+        if profile is not None:
+            record["resources"] = profile
+        self.emit(record)
+
+    def addSuccess(self, test):
+        super().addSuccess(test)
+        self._record(test, True)
+
+    def addFailure(self, test, err):
+        super().addFailure(test, err)
+        self._record(test, False, self._exc_info_to_string(err, test))
+
+    def addError(self, test, err):
+        super().addError(test, err)
+        self._record(test, False, self._exc_info_to_string(err, test))
+
+    def addSkip(self, test, reason):
+        super().addSkip(test, reason)
+        self._record(test, True, f"skipped: {reason}")
@@ -0,0 +1,288 @@
+"""
+Spectra ancillary state-machine model and reachability explorer.
+
+The model mirrors the ancillary states used by the Spectra integration
+tests (initialized, running, paused, stopped) plus the error/recovery path.
+The explorer enumerates reachable states and transition sequences up to a
+depth bound so deep sequence coverage does not rely on hand-written cases.
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+# A state is (status, retries used since the last reset).
+State = Tuple[str, int]
+Edge = Tuple[State, str, State]
+
+
+def _always(retries: int, config: Dict[str, Any]) -> bool:
+    """Guard that always allows the transition."""
+    return True
+
+
+def _can_retry(retries: int, config: Dict[str, Any]) -> bool:
+    """Guard allowing recovery while retry attempts remain."""
+    return retries < config["retry_attempts"]
+
+
+def _retries_exhausted(retries: int, config: Dict[str, Any]) -> bool:
+    """Guard allowing abort once every retry attempt has been used."""
+    return retries >= config["retry_attempts"]
+
+
+class Transition:
+    """A named transition between ancillary states."""
+
+    def __init__(self, name: str, sources: Sequence[str], target: str,
+                 guard: Callable[[int, Dict[str, Any]], bool] = _always,
+                 retries: str = "keep"):
+        """
+        Initialize a transition.
+
+        Args:
+            name: Transition (event) name.
+            sources: Statuses the transition may fire from.
+            target: Status after the transition.
+            guard: Module-level predicate over (retries, config); module-level
+                so machines can be pickled into explorer worker processes.
+            retries: Effect on the retry counter: "keep", "increment" or "reset".
+        """
+        self.name = name
+        self.sources = tuple(sources)
+        self.target = target
+        self.guard = guard
+        self.retries = retries
+
+    def enabled(self, state: State, config: Dict[str, Any]) -> bool:
+        """Check whether the transition can fire from ``state``."""
+        return state[0] in self.sources and self.guard(state[1], config)
+
+    def apply(self, state: State) -> State:
+        """Return the state reached by firing the transition."""
+        retries = state[1]
+        if self.retries == "increment":
+            retries += 1
+        elif self.retries == "reset":
+            retries = 0
+        return (self.target, retries)
+
+
+SPECTRA_TRANSITIONS = [
+    Transition("start", ["initialized"], "running"),
+    Transition("pause", ["running"], "paused"),
+    Transition("resume", ["paused", "recovered"], "running"),
+    Transition("stop", ["running", "paused", "recovered"], "stopped"),
+    Transition("fail", ["running", "paused"], "error"),
+    Transition("recover", ["error"], "recovered", guard=_can_retry, retries="increment"),
+    Transition("abort", ["error"], "stopped", guard=_retries_exhausted),
+    Transition("reset", ["stopped"], "initialized", retries="reset"),
+]
+
+
+class SpectraStateMachine:
+    """State-machine model of the Spectra ancillary integration."""
+
+    STATES = ["initialized", "running", "paused", "stopped", "error", "recovered"]
+
+    def __init__(self, configuration: Optional[Dict[str, Any]] = None,
+                 initial_status: str = "initialized",
+                 transitions: Optional[List[Transition]] = None):
+        """Initialize from a Spectra fixture ``configuration`` block."""
+        self.config = dict(configuration or {"retry_attempts": 3})
+        self.initial: State = (initial_status, 0)
+        self.transitions = transitions or SPECTRA_TRANSITIONS
+        if initial_status not in self.STATES:
+            raise ValueError(f"Unknown initial status: {initial_status}")
+
+    def enabled(self, state: State) -> List[Transition]:
+        """List transitions enabled in ``state``."""
+        return [t for t in self.transitions if t.enabled(state, self.config)]
+
+    def successors(self, state: State) -> List[Tuple[str, State]]:
+        """List (transition name, next state) pairs from ``state``."""
+        return [(t.name, t.apply(state)) for t in self.enabled(state)]
+
+    def run(self, events: Iterable[str], state: Optional[State] = None) -> State:
+        """Fire ``events`` in order, raising ValueError on an invalid event."""
+        state = state or self.initial
+        for event in events:
+            for name, target in self.successors(state):
+                if name == event:
+                    state = target
+                    break
+            else:
+                raise ValueError(f"Transition '{event}' not allowed from {state}")
+        return state
+
+
+def _expand(machine: SpectraStateMachine, states: List[State]) -> List[Edge]:
+    """Expand a slice of the frontier; runs in explorer worker processes."""
+    return [(state, name, target)
+            for state in states
+            for name, target in machine.successors(state)]
+
+
+class StateSpaceExplorer:
+    """Breadth-first explorer of reachable states and transition sequences."""
+
+    def __init__(self, machine: SpectraStateMachine, max_depth: int,
+                 workers: Optional[int] = None, min_parallel_frontier: int = 256):
+        """
+        Initialize the explorer.
+
+        Args:
+            machine: Model to explore.
+            max_depth: Maximum number of transitions in a sequence.
+            workers: Process pool size for frontier expansion; None or 1
+                expands in-process.
+            min_parallel_frontier: Frontiers smaller than this are expanded
+                in-process even when a pool is configured.
+        """
+        self.machine = machine
+        self.max_depth = max_depth
+        self.workers = workers
+        self.min_parallel_frontier = min_parallel_frontier
+        self._graph: Dict[State, List[State]] = {}
+        self._count_memo: Dict[Tuple[State, int], int] = {}
+        self._distance_memo: Dict[str, Dict[State, int]] = {}
+
+    def explore(self) -> Dict[str, Any]:
+        """
+        Explore the state space up to ``max_depth``.
+
+        Each state is expanded once, at its shortest depth; later paths that
+        reach an already visited state are pruned since they lead to the same
+        suffixes. Every enabled edge is still recorded for coverage.
+        """
+        initial = self.machine.initial
+        depth: Dict[State, int] = {initial: 0}
+        witness: Dict[State, List[str]] = {initial: []}
+        edges: Set[Edge] = set()
+        frontier = [initial]
+        level_sizes = [1]
+
+        pool = None
+        if self.workers and self.workers > 1:
+            pool = ProcessPoolExecutor(max_workers=self.workers)
+        try:
+            for level in range(1, self.max_depth + 1):
+                if not frontier:
+                    break
+                next_frontier = []
+                for source, name, target in self._expand_frontier(frontier, pool):
+                    edges.add((source, name, target))
+                    if target not in depth:
+                        depth[target] = level
+                        witness[target] = witness[source] + [name]
+                        next_frontier.append(target)
+                frontier = next_frontier
+                level_sizes.append(len(frontier))
+        finally:
+            if pool is not None:
+                pool.shutdown()
+
+        return {
+            "reachable": set(depth),
+            "depth": depth,
+            "witness": witness,
+            "edges": edges,
+            "transitions_covered": {name for _, name, _ in edges},
+            "statuses_covered": {state[0] for state in depth},
+            "level_sizes": level_sizes,
+            "sequence_count": self.count_sequences(),
+        }
+
+    def _expand_frontier(self, frontier: List[State],
+                         pool: Optional[ProcessPoolExecutor]) -> List[Edge]:
+        """Expand a frontier, spreading large ones across the pool."""
+        if pool is None or len(frontier) < self.min_parallel_frontier:
+            return _expand(self.machine, frontier)
+        size = -(-len(frontier) // self.workers)
+        chunks = [frontier[i:i + size] for i in range(0, len(frontier), size)]
+        results = pool.map(_expand, [self.machine] * len(chunks), chunks)
+        return [edge for chunk in results for edge in chunk]
+
+    def count_sequences(self, state: Optional[State] = None,
+                        depth: Optional[int] = None) -> int:
+        """
+        Count distinct transition sequences of length 1..depth from ``state``.
+
+        Counts are built bottom-up one depth at a time over the reachable
+        states, so the result is exact without enumerating the exponentially
+        many sequences or recursing once per depth.
+        """
+        state = state or self.machine.initial
+        depth = self.max_depth if depth is None else depth
+        if depth <= 0:
+            return 0
+        key = (state, depth)
+        if key not in self._count_memo:
+            graph = self._successor_graph(state)
+            counts = dict.fromkeys(graph, 0)
+            for _ in range(depth):
+                counts = {s: sum(1 + counts[t] for t in targets)
+                          for s, targets in graph.items()}
+            self._count_memo[key] = counts[state]
+        return self._count_memo[key]
+
+    def sequences_to(self, status: str, limit: int = 10) -> List[List[str]]:
+        """Enumerate up to ``limit`` shortest-first sequences ending in ``status``."""
+        found: List[List[str]] = []
+        paths: List[Tuple[State, List[str]]] = [(self.machine.initial, [])]
+        for _ in range(self.max_depth):
+            extended = []
+            for state, path in paths:
+                for name, target in self.machine.successors(state):
+                    # Prune sequences that cannot reach the status in time.
+                    if not self._can_reach(target, status, self.max_depth - len(path) - 1):
+                        continue
+                    extended.append((target, path + [name]))
+                    if target[0] == status:
+                        found.append(path + [name])
+                        if len(found) >= limit:
+                            return found
+            paths = extended
+        return found
+
+    def _can_reach(self, state: State, status: str, remaining: int) -> bool:
+        """Check whether ``status`` is reachable from ``state`` within ``remaining`` steps."""
+        if state[0] == status:
+            return True
+        self._successor_graph(state)
+        distance = self._distances_to(status).get(state)
+        return distance is not None and distance <= remaining
+
+    def _successor_graph(self, root: State) -> Dict[State, List[State]]:
+        """Extend the cached successor graph with every state reachable from ``root``."""
+        pending = [root]
+        while pending:
+            state = pending.pop()
+            if state in self._graph:
+                continue
+            targets = [target for _, target in self.machine.successors(state)]
+            self._graph[state] = targets
+            # Distances were computed over a smaller graph.
+            self._distance_memo.clear()
+            pending.extend(t for t in targets if t not in self._graph)
+        return self._graph
+
+    def _distances_to(self, status: str) -> Dict[State, int]:
+        """Shortest number of steps from each known state to one with ``status``."""
+        graph = self._successor_graph(self.machine.initial)
+        if status not in self._distance_memo:
+            predecessors: Dict[State, List[State]] = {s: [] for s in graph}
+            for source, targets in graph.items():
+                for target in targets:
+                    predecessors[target].append(source)
+            frontier = [s for s in graph if s[0] == status]
+            distance = dict.fromkeys(frontier, 0)
+            while frontier:
+                next_frontier = []
+                for target in frontier:
+                    for source in predecessors[target]:
+                        if source not in distance:
+                            distance[source] = distance[target] + 1
+                            next_frontier.append(source)
+                frontier = next_frontier
+            self._distance_memo[status] = distance
+        return self._distance_memo[status]
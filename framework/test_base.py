@@ -6,12 +6,20 @@ Provides common setup, teardown, and utility methods.
 import unittest
 import logging
 from datetime import datetime
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Optional, Sequence
+
+from .metrics_engine import max_breach_duration
+from .profiling import ResourceProfiler, default_sample_rate, is_sampled, profiling_enabled
 
 
 class TestBase(unittest.TestCase):
     """Base class for all regression tests."""
 
+    # Opt-in per-test resource profiling (see framework.profiling).
+    profile_resources = False
+    profile_sample_rate: Optional[float] = None
+    resource_profiles: Dict[str, Dict[str, Any]] = {}
+
     @classmethod
     def setUpClass(cls):
         """Set up test class."""
@@ -32,11 +40,28 @@ class TestBase(unittest.TestCase):
         """Set up test method."""
         self.test_id = self.id()
         self.logger.debug(f"Running test: {self.test_id}")
+        self.resource_profile: Optional[Dict[str, Any]] = None
+        self._profiler = None
+        if profiling_enabled(self.profile_resources):
+            rate = self.profile_sample_rate
+            if rate is None:
+                rate = default_sample_rate()
+            self._profiler = ResourceProfiler(is_sampled(self.test_id, rate))
+            self._profiler.start()
+            # A cleanup still runs if a subclass setUp fails after this point.
+            self.addCleanup(self._stop_profiler)
 
     def tearDown(self):
         """Tear down test method."""
         self.logger.debug(f"Completed test: {self.test_id}")
 
+    def _stop_profiler(self):
+        """Stop the per-test profiler and record its profile."""
+        if self._profiler is not None:
+            self.resource_profile = self._profiler.stop()
+            TestBase.resource_profiles[self.test_id] = self.resource_profile
+            self._profiler = None
+
     def assert_equals(self, expected: Any, actual: Any, message: str = ""):
         """Assert equality with custom message."""
         self.assertEqual(expected, actual, message)
@@ -53,6 +78,14 @@ class TestBase(unittest.TestCase):
         """Assert condition is False."""
         self.assertFalse(condition, message)
 
+    def assert_breach_duration_below(self, times: Sequence[float],
+                                     values: Sequence[float], threshold: float,
+                                     max_duration: float, message: str = ""):
+        """Assert no continuous breach of ``threshold`` lasts ``max_duration`` or longer."""
+        longest = max_breach_duration(times, values, threshold)
+        self.assertLess(longest, max_duration, message or
+                        f"Breach of {threshold} lasted {longest:.1f}s")
+
     def log_info(self, message: str):
         """Log info message."""
         self.logger.info(message)
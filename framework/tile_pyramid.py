@@ -0,0 +1,227 @@
+"""
+Incremental multi-zoom TILE pyramid of GPS fix density and accuracy.
+
+Fixes are binned into Web-Mercator tiles at the deepest zoom level and
+reduced bottom-up to zoom 0. Tiles are keyed by Morton (Z-order) codes, so
+a tile's parent is simply ``key >> 2`` and each level is one sorted
+reduction. Each batch only upserts the tiles it touches into a compact
+SQLite store, so coverage at any zoom can be queried without
+re-aggregating earlier data.
+"""
+
+import sqlite3
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple, Union
+
+import numpy as np
+
+
+MAX_LATITUDE = 85.05112878
+MAX_SUPPORTED_ZOOM = 30
+
+_SPREAD_MASKS = [
+    (16, 0x0000FFFF0000FFFF),
+    (8, 0x00FF00FF00FF00FF),
+    (4, 0x0F0F0F0F0F0F0F0F),
+    (2, 0x3333333333333333),
+    (1, 0x5555555555555555),
+]
+
+_COMPACT_MASKS = [
+    (1, 0x3333333333333333),
+    (2, 0x0F0F0F0F0F0F0F0F),
+    (4, 0x00FF00FF00FF00FF),
+    (8, 0x0000FFFF0000FFFF),
+    (16, 0x00000000FFFFFFFF),
+]
+
+
+def _spread_bits(value: np.ndarray) -> np.ndarray:
+    """Insert a zero bit between each of the low 32 bits of ``value``."""
+    value = value.astype(np.uint64) & np.uint64(0xFFFFFFFF)
+    for shift, mask in _SPREAD_MASKS:
+        value = (value | (value << np.uint64(shift))) & np.uint64(mask)
+    return value
+
+
+def _compact_bits(value: np.ndarray) -> np.ndarray:
+    """Inverse of _spread_bits: gather every other bit."""
+    value = value.astype(np.uint64) & np.uint64(0x5555555555555555)
+    for shift, mask in _COMPACT_MASKS:
+        value = (value | (value >> np.uint64(shift))) & np.uint64(mask)
+    return value
+
+
+def morton_encode(x: np.ndarray, y: np.ndarray) -> np.ndarray:
+    """Interleave tile x/y into Morton keys (x in even bits, y in odd bits)."""
+    return (_spread_bits(x) | (_spread_bits(y) << np.uint64(1))).astype(np.int64)
+
+
+def morton_decode(key: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Split Morton keys back into tile x/y."""
+    key = np.asarray(key).astype(np.uint64)
+    x = _compact_bits(key)
+    y = _compact_bits(key >> np.uint64(1))
+    return x.astype(np.int64), y.astype(np.int64)
+
+
+def lonlat_to_tile(latitude: np.ndarray, longitude: np.ndarray,
+                   zoom: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Web-Mercator (slippy map) tile indices of each fix at ``zoom``."""
+    n = 1 << zoom
+    lat = np.radians(np.clip(np.asarray(latitude, dtype=np.float64),
+                             -MAX_LATITUDE, MAX_LATITUDE))
+    lon = np.asarray(longitude, dtype=np.float64)
+    x = np.floor((lon + 180.0) / 360.0 * n)
+    y = np.floor((1.0 - np.arcsinh(np.tan(lat)) / np.pi) / 2.0 * n)
+    return (np.clip(x, 0, n - 1).astype(np.int64),
+            np.clip(y, 0, n - 1).astype(np.int64))
+
+
+def _reduce_sorted(keys: np.ndarray, count: np.ndarray, total: np.ndarray,
+                   total_sq: np.ndarray, peak: np.ndarray):
+    """Combine rows sharing a key; ``keys`` must be sorted."""
+    starts = np.flatnonzero(np.concatenate(([True], keys[1:] != keys[:-1])))
+    return (keys[starts],
+            np.add.reduceat(count, starts),
+            np.add.reduceat(total, starts),
+            np.add.reduceat(total_sq, starts),
+            np.maximum.reduceat(peak, starts))
+
+
+class TilePyramid:
+    """Multi-zoom tile aggregates of fix counts and accuracy statistics."""
+
+    def __init__(self, max_zoom: int, path: Union[str, Path, None] = None):
+        """
+        Initialize the pyramid.
+
+        Args:
+            max_zoom: Deepest zoom level; levels 0..max_zoom are maintained.
+            path: SQLite file for the tile store; None keeps it in memory.
+        """
+        if not 0 <= max_zoom <= MAX_SUPPORTED_ZOOM:
+            raise ValueError(f"max_zoom must be in 0..{MAX_SUPPORTED_ZOOM}")
+        self.max_zoom = max_zoom
+        self.path = str(path) if path is not None else ":memory:"
+        self.connection = sqlite3.connect(self.path)
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS tiles ("
+            " zoom INTEGER NOT NULL, key INTEGER NOT NULL,"
+            " count INTEGER NOT NULL, accuracy_sum REAL NOT NULL,"
+            " accuracy_sq_sum REAL NOT NULL, accuracy_max REAL NOT NULL,"
+            " PRIMARY KEY (zoom, key)) WITHOUT ROWID"
+        )
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value INTEGER)"
+        )
+        stored = self.connection.execute(
+            "SELECT value FROM meta WHERE name = 'max_zoom'").fetchone()
+        if stored is None:
+            self.connection.execute(
+                "INSERT INTO meta VALUES ('max_zoom', ?)", (max_zoom,))
+        elif stored[0] != max_zoom:
+            self.connection.close()
+            raise ValueError(f"Store at {self.path} was built with max_zoom={stored[0]}")
+        self.connection.commit()
+
+    @classmethod
+    def from_tile_config(cls, tile_config: Dict[str, Any],
+                         path: Union[str, Path, None] = None) -> "TilePyramid":
+        """Build a pyramid whose deepest level matches a TILE ``grid_size``."""
+        return cls(int(tile_config["grid_size"]).bit_length() - 1, path)
+
+    def close(self):
+        """Close the tile store."""
+        self.connection.close()
+
+    def add_batch(self, latitude: np.ndarray, longitude: np.ndarray,
+                  accuracy: np.ndarray) -> int:
+        """
+        Aggregate a batch of fixes into every zoom level.
+
+        Fixes with a non-finite latitude, longitude or accuracy (receiver
+        dropouts) are skipped. Returns the number of tiles touched across all
+        levels; only those rows are written to the store.
+        """
+        latitude = np.asarray(latitude, dtype=np.float64)
+        longitude = np.asarray(longitude, dtype=np.float64)
+        accuracy = np.asarray(accuracy, dtype=np.float64)
+        finite = np.isfinite(latitude) & np.isfinite(longitude) & np.isfinite(accuracy)
+        if not finite.all():
+            latitude, longitude, accuracy = latitude[finite], longitude[finite], accuracy[finite]
+        if not len(accuracy):
+            return 0
+        x, y = lonlat_to_tile(latitude, longitude, self.max_zoom)
+        keys = morton_encode(x, y)
+        order = np.argsort(keys, kind="stable")
+        level = _reduce_sorted(keys[order], np.ones(len(keys), dtype=np.int64),
+                               accuracy[order], accuracy[order] ** 2, accuracy[order])
+
+        rows = []
+        for zoom in range(self.max_zoom, -1, -1):
+            keys, count, total, total_sq, peak = level
+            rows.extend(zip([zoom] * len(keys), keys.tolist(), count.tolist(),
+                            total.tolist(), total_sq.tolist(), peak.tolist()))
+            if zoom:
+                # Parent keys of sorted children stay sorted.
+                level = _reduce_sorted(keys >> 2, count, total, total_sq, peak)
+
+        with self.connection:
+            self.connection.executemany(
+                "INSERT INTO tiles VALUES (?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT (zoom, key) DO UPDATE SET"
+                " count = count + excluded.count,"
+                " accuracy_sum = accuracy_sum + excluded.accuracy_sum,"
+                " accuracy_sq_sum = accuracy_sq_sum + excluded.accuracy_sq_sum,"
+                " accuracy_max = MAX(accuracy_max, excluded.accuracy_max)",
+                rows,
+            )
+        return len(rows)
+
+    def tiles(self, zoom: int) -> Dict[str, np.ndarray]:
+        """All occupied tiles at ``zoom`` as columnar arrays."""
+        data = self.connection.execute(
+            "SELECT key, count, accuracy_sum, accuracy_sq_sum, accuracy_max "
+            "FROM tiles WHERE zoom = ? ORDER BY key", (zoom,)).fetchall()
+        if not data:
+            data = np.empty((0, 5))
+        columns = np.array(data, dtype=np.float64).T
+        keys = np.array([row[0] for row in data], dtype=np.int64)
+        count, total, total_sq, peak = columns[1:]
+        x, y = morton_decode(keys)
+        count = count.astype(np.int64)
+        mean = total / np.maximum(count, 1)
+        variance = np.maximum(total_sq / np.maximum(count, 1) - mean ** 2, 0.0)
+        return {
+            "x": x, "y": y, "count": count,
+            "mean_accuracy": mean, "std_accuracy": np.sqrt(variance),
+            "max_accuracy": peak.astype(np.float64),
+        }
+
+    def tile(self, zoom: int, x: int, y: int) -> Optional[Dict[str, float]]:
+        """Statistics for a single tile, or None if it has no fixes."""
+        key = int(morton_encode(np.array([x]), np.array([y]))[0])
+        row = self.connection.execute(
+            "SELECT count, accuracy_sum, accuracy_sq_sum, accuracy_max "
+            "FROM tiles WHERE zoom = ? AND key = ?", (zoom, key)).fetchone()
+        if row is None:
+            return None
+        count, total, total_sq, peak = row
+        mean = total / count
+        return {
+            "count": count,
+            "mean_accuracy": mean,
+            "std_accuracy": max(total_sq / count - mean ** 2, 0.0) ** 0.5,
+            "max_accuracy": peak,
+        }
+
+    def coverage(self, zoom: int, min_count: int = 1,
+                 max_mean_accuracy: Optional[float] = None) -> int:
+        """Number of tiles at ``zoom`` with enough (and accurate enough) fixes."""
+        query = "SELECT COUNT(*) FROM tiles WHERE zoom = ? AND count >= ?"
+        params = [zoom, min_count]
+        if max_mean_accuracy is not None:
+            query += " AND accuracy_sum <= ? * count"
+            params.append(max_mean_accuracy)
+        return self.connection.execute(query, params).fetchone()[0]
@@ -0,0 +1,178 @@
+"""
+Bulk ISO-8601 timestamp parsing and trace timing checks.
+
+Timestamp strings are decoded as a fixed-width character matrix, so
+millions of rows convert to int64 epoch nanoseconds without creating a
+datetime object per row. Timing checks (monotonicity, duplicates, gaps,
+sampling jitter) run on the resulting arrays and return a plain summary
+dict suitable for ReportGenerator sections.
+"""
+
+from typing import Any, Dict, Iterable, Optional
+
+import numpy as np
+
+
+NS_PER_SECOND = 1_000_000_000
+_DIGIT_COLUMNS = [0, 1, 2, 3, 5, 6, 8, 9, 11, 12, 14, 15, 17, 18]
+_FRACTION_SCALE = 10 ** np.arange(8, -1, -1, dtype=np.int64)
+_DAYS_IN_MONTH = np.array([31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31], dtype=np.int64)
+# Whole years representable as int64 nanoseconds (1677-09-21 .. 2262-04-11).
+MIN_YEAR, MAX_YEAR = 1678, 2261
+
+
+def days_from_civil(year: np.ndarray, month: np.ndarray, day: np.ndarray) -> np.ndarray:
+    """Vectorized days since 1970-01-01 for proleptic Gregorian dates."""
+    year = year - (month <= 2)
+    era = np.floor_divide(year, 400)
+    yoe = year - era * 400
+    mp = (month + 9) % 12
+    doy = (153 * mp + 2) // 5 + day - 1
+    doe = yoe * 365 + yoe // 4 - yoe // 100 + doy
+    return era * 146097 + doe - 719468
+
+
+def _number(digits: np.ndarray, first: int, width: int) -> np.ndarray:
+    """Combine ``width`` digit columns starting at ``first`` into integers."""
+    weights = 10 ** np.arange(width - 1, -1, -1, dtype=np.int64)
+    return digits[:, first:first + width].astype(np.int64) @ weights
+
+
+def parse_iso8601(timestamps: Iterable[str]) -> np.ndarray:
+    """
+    Parse ISO-8601 timestamps to int64 nanoseconds since the Unix epoch.
+
+    Accepts ``YYYY-MM-DD[T ]HH:MM:SS`` with an optional fraction of up to
+    nine significant digits (extra digits are truncated) and an optional
+    ``Z`` or ``+HH:MM``/``+HHMM`` offset. Timestamps without an offset, such
+    as ``datetime.now().isoformat()`` in the fixtures, are taken as UTC.
+    Years must lie in MIN_YEAR..MAX_YEAR so the result fits in int64.
+
+    Raises:
+        ValueError: If any timestamp is malformed; the message names the
+            first offending row.
+    """
+    try:
+        strings = np.asarray(timestamps, dtype=np.bytes_)
+    except UnicodeEncodeError as e:
+        raise ValueError(f"Invalid ISO-8601 timestamp: {e}") from e
+    n = len(strings)
+    if n == 0:
+        return np.empty(0, dtype=np.int64)
+    width = max(strings.dtype.itemsize, 21)
+    # Pad so offset lookups past the end of short rows read NUL characters.
+    chars = np.zeros((n, width + 8), dtype=np.uint8)
+    raw = strings.view(np.uint8).reshape(n, -1)
+    chars[:, :raw.shape[1]] = raw
+    digits = chars - np.uint8(48)  # non-digits wrap to values above 9
+    is_digit = digits <= 9
+
+    ok = is_digit[:, _DIGIT_COLUMNS].all(axis=1)
+    ok &= (chars[:, 4] == 45) & (chars[:, 7] == 45)
+    ok &= (chars[:, 10] == 84) | (chars[:, 10] == 32)
+    ok &= (chars[:, 13] == 58) & (chars[:, 16] == 58)
+
+    year, month, day = _number(digits, 0, 4), _number(digits, 5, 2), _number(digits, 8, 2)
+    hour, minute, second = _number(digits, 11, 2), _number(digits, 14, 2), _number(digits, 17, 2)
+    leap = (year % 4 == 0) & ((year % 100 != 0) | (year % 400 == 0))
+    month_days = _DAYS_IN_MONTH[np.clip(month - 1, 0, 11)] + (leap & (month == 2))
+    ok &= (year >= MIN_YEAR) & (year <= MAX_YEAR)
+    ok &= (month >= 1) & (month <= 12) & (day >= 1) & (day <= month_days)
+    ok &= (hour <= 23) & (minute <= 59) & (second <= 60)
+
+    # Fraction: run of digits after a '.' at column 19.
+    has_fraction = chars[:, 19] == 46
+    run = np.argmin(is_digit[:, 20:], axis=1)
+    fraction_length = np.where(has_fraction, run, 0)
+    ok &= ~has_fraction | (fraction_length > 0)
+    significant = np.arange(9) < fraction_length[:, None]
+    nanos = np.where(significant, digits[:, 20:29], 0).astype(np.int64) @ _FRACTION_SCALE
+
+    # Offset: 'Z', '+HH:MM', '+HHMM' or end of string.
+    rows = np.arange(n)
+    tz = 19 + np.where(has_fraction, fraction_length + 1, 0)
+    sign_char = chars[rows, tz]
+    is_zulu = sign_char == 90
+    is_offset = (sign_char == 43) | (sign_char == 45)
+    colon = chars[rows, tz + 3] == 58
+    minute_at = tz + 3 + colon
+    offset_ok = (is_digit[rows, tz + 1] & is_digit[rows, tz + 2]
+                 & is_digit[rows, minute_at] & is_digit[rows, minute_at + 1])
+    offset_hours = digits[rows, tz + 1].astype(np.int64) * 10 + digits[rows, tz + 2]
+    offset_minutes = digits[rows, minute_at].astype(np.int64) * 10 + digits[rows, minute_at + 1]
+    offset = offset_hours * 3600 + offset_minutes * 60
+    offset = np.where(is_offset, np.where(sign_char == 45, -offset, offset), 0)
+    end = np.where(is_offset, minute_at + 2, np.where(is_zulu, tz + 1, tz))
+    ok &= ~is_offset | (offset_ok & (offset_hours <= 23) & (offset_minutes <= 59))
+    ok &= (sign_char == 0) | is_zulu | is_offset
+    ok &= chars[rows, np.minimum(end, width + 7)] == 0
+
+    if not ok.all():
+        bad = int(np.argmin(ok))
+        text = strings[bad].decode("ascii")
+        raise ValueError(f"Invalid ISO-8601 timestamp at row {bad}: {text!r}")
+
+    seconds = (days_from_civil(year, month, day) * 86400
+               + hour * 3600 + minute * 60 + second - offset)
+    return seconds * NS_PER_SECOND + nanos
+
+
+def format_ns(value: int) -> str:
+    """Format epoch nanoseconds as an ISO-8601 UTC string."""
+    return str(np.datetime64(int(value), "ns")) + "Z"
+
+
+def check_timestamps(ns: np.ndarray, max_gap_seconds: float,
+                     expected_interval_seconds: Optional[float] = None) -> Dict[str, Any]:
+    """
+    Summarize timing problems in a trace of epoch-nanosecond timestamps.
+
+    Args:
+        ns: Timestamps in recorded order.
+        max_gap_seconds: Intervals longer than this count as gaps.
+        expected_interval_seconds: Nominal sampling interval; defaults to
+            the median positive interval.
+
+    Returns:
+        Summary with counts of non-monotonic steps, duplicates and gaps,
+        the largest gap, and sampling interval/jitter statistics (seconds).
+    """
+    ns = np.asarray(ns, dtype=np.int64)
+    summary: Dict[str, Any] = {"samples": int(len(ns))}
+    if len(ns) < 2:
+        summary.update({"monotonic": True, "non_monotonic": 0, "duplicates": 0,
+                        "gaps": 0})
+        return summary
+
+    deltas = np.diff(ns)
+    backwards = deltas < 0
+    duplicates = deltas == 0
+    max_gap = int(max_gap_seconds * NS_PER_SECOND)
+    gaps = deltas > max_gap
+    regular = ~(backwards | duplicates | gaps)
+
+    positive = deltas[deltas > 0]
+    median = float(np.median(positive)) if len(positive) else 0.0
+    expected = (expected_interval_seconds * NS_PER_SECOND
+                if expected_interval_seconds is not None else median)
+    steady = deltas[regular]
+    jitter = steady - expected
+
+    summary.update({
+        "start": format_ns(ns.min()),
+        "end": format_ns(ns.max()),
+        "monotonic": not backwards.any(),
+        "non_monotonic": int(np.count_nonzero(backwards)),
+        "first_non_monotonic_index": (int(np.argmax(backwards)) + 1
+                                      if backwards.any() else None),
+        "duplicates": int(np.count_nonzero(duplicates)),
+        "gaps": int(np.count_nonzero(gaps)),
+        "largest_gap_seconds": float(deltas.max()) / NS_PER_SECOND if gaps.any() else 0.0,
+        "median_interval_seconds": median / NS_PER_SECOND,
+        "sampling_rate_hz": NS_PER_SECOND / median if median else 0.0,
+        "jitter_rms_seconds": (float(np.sqrt(np.mean(jitter.astype(np.float64) ** 2)))
+                               / NS_PER_SECOND if len(jitter) else 0.0),
+        "jitter_max_seconds": (float(np.abs(jitter).max()) / NS_PER_SECOND
+                               if len(jitter) else 0.0),
+    })
+    return summary
@@ -0,0 +1,275 @@
+"""
+Warm-worker watch daemon for fast regression test reruns.
+
+The daemon imports the framework and every test module once, then polls
+``framework/`` and ``tests/`` for changes. When a file changes it reloads
+only that module and the modules that depend on it, and reruns the test
+classes in the affected test modules. Runs happen in workers forked from
+the warm daemon process, so they skip interpreter startup, imports and
+collection; results stream back into a ReportGenerator as tests finish.
+
+Usage:
+    python -m framework.watch_daemon [--workers N] [--once]
+"""
+
+import argparse
+import importlib
+import json
+import os
+import selectors
+import sys
+import time
+import traceback
+import unittest
+from pathlib import Path
+from types import ModuleType
+from typing import Callable, Dict, List, Optional, Sequence, Set
+
+from .report_generator import ReportGenerator
+from .result_stream import StreamingResult
+
+
+def run_test_classes(classes: Sequence[type], emit: Callable[[Dict], None]):
+    """Run ``classes`` in-process, emitting a result record per test."""
+    loader = unittest.TestLoader()
+    suite = unittest.TestSuite(loader.loadTestsFromTestCase(cls) for cls in classes)
+    suite.run(StreamingResult(emit))
+
+
+class WatchDaemon:
+    """Keeps test modules warm and reruns affected test classes on change."""
+
+    def __init__(self, root: str = ".", watch_dirs: Sequence[str] = ("framework", "tests"),
+                 workers: int = 4, report: Optional[ReportGenerator] = None,
+                 on_result: Optional[Callable[[Dict], None]] = None):
+        """
+        Initialize the daemon.
+
+        Args:
+            root: Project root; it is put on ``sys.path`` for imports.
+            watch_dirs: Package directories (relative to root) to watch.
+            workers: Maximum forked workers per rerun.
+            report: Report that receives every streamed result.
+            on_result: Optional callback invoked as each result arrives.
+        """
+        self.root = Path(root).resolve()
+        self.watch_dirs = [self.root / d for d in watch_dirs]
+        self.workers = max(1, workers)
+        self.report = report
+        self.on_result = on_result
+        self.modules: Dict[str, ModuleType] = {}
+        self._mtimes: Dict[Path, int] = {}
+
+    def _module_name(self, path: Path) -> str:
+        """Map a source path to its dotted module name."""
+        parts = list(path.relative_to(self.root).with_suffix("").parts)
+        if parts[-1] == "__init__":
+            parts.pop()
+        return ".".join(parts)
+
+    def _scan(self) -> Dict[Path, int]:
+        """Return modification times of every watched Python file."""
+        mtimes = {}
+        for directory in self.watch_dirs:
+            for path in directory.rglob("*.py"):
+                try:
+                    mtimes[path] = path.stat().st_mtime_ns
+                except FileNotFoundError:
+                    continue
+        return mtimes
+
+    def preload(self):
+        """Import every watched module so later runs start warm."""
+        if str(self.root) not in sys.path:
+            sys.path.insert(0, str(self.root))
+        self._mtimes = self._scan()
+        for path in sorted(self._mtimes):
+            name = self._module_name(path)
+            self.modules[name] = importlib.import_module(name)
+
+    def dependencies(self, module: ModuleType) -> Set[str]:
+        """Watched modules that ``module`` references in its namespace."""
+        deps = set()
+        for value in vars(module).values():
+            if isinstance(value, ModuleType):
+                name = value.__name__
+            else:
+                name = getattr(value, "__module__", None)
+            if name in self.modules and name != module.__name__:
+                deps.add(name)
+        return deps
+
+    def affected_modules(self, changed: Set[str]) -> List[str]:
+        """Changed modules plus transitive dependents, dependencies first."""
+        graph = {name: self.dependencies(mod) for name, mod in self.modules.items()}
+        affected = set(changed)
+        grew = True
+        while grew:
+            dependents = {name for name, deps in graph.items() if deps & affected}
+            grew = not dependents <= affected
+            affected |= dependents
+
+        ordered: List[str] = []
+        visiting: Set[str] = set()
+
+        def visit(name: str):
+            if name in ordered or name in visiting:
+                return
+            visiting.add(name)
+            for dep in sorted(graph.get(name, ())):
+                if dep in affected:
+                    visit(dep)
+            ordered.append(name)
+
+        for name in sorted(affected):
+            visit(name)
+        return ordered
+
+    def test_classes(self, module_names: Sequence[str]) -> List[type]:
+        """TestCase classes defined in the given test modules."""
+        classes = []
+        for name in module_names:
+            module = self.modules.get(name)
+            if module is None or not name.rsplit(".", 1)[-1].startswith("test_"):
+                continue
+            for value in vars(module).values():
+                if (isinstance(value, type) and issubclass(value, unittest.TestCase)
+                        and value.__module__ == name and value.__name__.startswith("Test")):
+                    classes.append(value)
+        return classes
+
+    def poll(self) -> Set[str]:
+        """Return module names whose files changed, appeared or were deleted."""
+        current = self._scan()
+        changed = {path for path, mtime in current.items() if self._mtimes.get(path) != mtime}
+        removed = set(self._mtimes) - set(current)
+        self._mtimes = current
+        for path in removed:
+            self.modules.pop(self._module_name(path), None)
+        return {self._module_name(path) for path in changed}
+
+    def reload(self, changed: Set[str]) -> List[str]:
+        """Reload changed modules and their dependents; return them in order."""
+        affected = self.affected_modules(changed)
+        for name in affected:
+            try:
+                if name in self.modules:
+                    self.modules[name] = importlib.reload(self.modules[name])
+                else:
+                    self.modules[name] = importlib.import_module(name)
+            except Exception:
+                self._emit({"test_name": name, "passed": False, "duration": 0.0,
+                            "error": traceback.format_exc()})
+        return affected
+
+    def _emit(self, result: Dict):
+        """Deliver a result to the report and callback."""
+        if self.report is not None:
+            self.report.add_test_result(result["test_name"], result["passed"],
+                                        result["duration"], result["error"],
+                                        resources=result.get("resources"))
+        if self.on_result is not None:
+            self.on_result(result)
+
+    def run_classes(self, classes: Sequence[type]) -> List[Dict]:
+        """Run test classes in forked warm workers, streaming results back."""
+        results: List[Dict] = []
+
+        def collect(result: Dict):
+            results.append(result)
+            self._emit(result)
+
+        if not classes:
+            return results
+        if not hasattr(os, "fork"):
+            run_test_classes(classes, collect)
+            return results
+
+        shares = [list(classes[i::self.workers]) for i in range(self.workers)]
+        selector = selectors.DefaultSelector()
+        children = []
+        for share in filter(None, shares):
+            read_fd, write_fd = os.pipe()
+            pid = os.fork()
+            if pid == 0:  # worker; must never return into the daemon's loop
+                code = 1
+                try:
+                    os.close(read_fd)
+                    with os.fdopen(write_fd, "w", buffering=1) as pipe:
+                        def send(result: Dict):
+                            pipe.write(json.dumps(result) + "\n")
+                        run_test_classes(share, send)
+                    code = 0
+                except BaseException:
+                    traceback.print_exc()
+                finally:
+                    os._exit(code)
+            os.close(write_fd)
+            stream = os.fdopen(read_fd, "r")
+            selector.register(stream, selectors.EVENT_READ)
+            children.append(pid)
+
+        open_streams = len(children)
+        while open_streams:
+            for key, _ in selector.select():
+                line = key.fileobj.readline()
+                if line:
+                    collect(json.loads(line))
+                else:
+                    selector.unregister(key.fileobj)
+                    key.fileobj.close()
+                    open_streams -= 1
+        for pid in children:
+            os.waitpid(pid, 0)
+        selector.close()
+        return results
+
+    def run_all(self) -> List[Dict]:
+        """Run every preloaded test class."""
+        return self.run_classes(self.test_classes(list(self.modules)))
+
+    def step(self) -> List[Dict]:
+        """Poll once; reload and rerun whatever changed."""
+        changed = self.poll()
+        if not changed:
+            return []
+        return self.run_classes(self.test_classes(self.reload(changed)))
+
+    def serve(self, poll_interval: float = 0.2):
+        """Watch forever, rerunning affected tests after each change."""
+        while True:
+            self.step()
+            time.sleep(poll_interval)
+
+
+def main(argv: Optional[Sequence[str]] = None):
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description="Warm-worker test watch daemon")
+    parser.add_argument("--root", default=".")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--interval", type=float, default=0.2)
+    parser.add_argument("--once", action="store_true", help="run all tests once and exit")
+    args = parser.parse_args(argv)
+
+    def show(result: Dict):
+        status = "PASSED" if result["passed"] else "FAILED"
+        print(f"{status} {result['test_name']} ({result['duration'] * 1000:.1f} ms)")
+        if result["error"] and not result["passed"]:
+            print(result["error"])
+
+    report = ReportGenerator()
+    daemon = WatchDaemon(args.root, workers=args.workers, report=report, on_result=show)
+    daemon.preload()
+    daemon.run_all()
+    if args.once:
+        report.save_json_report()
+        return
+    try:
+        daemon.serve(args.interval)
+    except KeyboardInterrupt:
+        report.save_json_report()
+        report.save_html_report()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,158 @@
+"""
+Aurora Streaming Health Metrics Regression Tests
+Tests for rolling-window metrics, breach durations and report downsampling.
+"""
+
+import tempfile
+import unittest
+import sys
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from framework.test_base import TestBase
+from framework.fixtures import TestFixtures
+from framework.metrics_engine import (
+    BreachTracker, MetricsEngine, RollingWindow, breach_intervals, lttb_downsample,
+)
+from framework.report_generator import ReportGenerator
+
+
+class TestAuroraRollingWindow(TestBase):
+    """Test O(1) rolling-window statistics."""
+
+    def setUp(self):
+        """Set up a synthetic CPU series sampled once per second."""
+        super().setUp()
+        rng = np.random.default_rng(7)
+        self.times = np.arange(2000, dtype=np.float64)
+        self.values = rng.uniform(0, 100, len(self.times))
+
+    def test_window_matches_exact_statistics(self):
+        """Test mean and max match a brute-force window."""
+        window = RollingWindow(window_seconds=60)
+        for t, v in zip(self.times, self.values):
+            window.push(t, v)
+        tail = self.values[-60:]
+        self.assert_equals(60, len(window))
+        self.assertAlmostEqual(tail.mean(), window.mean)
+        self.assertAlmostEqual(tail.max(), window.max)
+
+    def test_quantile_within_one_bin(self):
+        """Test the histogram quantile is within one bin width."""
+        window = RollingWindow(window_seconds=600, bins=200)
+        for t, v in zip(self.times, self.values):
+            window.push(t, v)
+        exact = np.quantile(self.values[-600:], 0.95)
+        self.assertLessEqual(abs(window.quantile(0.95) - exact), 100 / 200)
+
+    def test_empty_window(self):
+        """Test an empty window reports NaN statistics."""
+        window = RollingWindow(window_seconds=60)
+        self.assert_true(np.isnan(window.mean))
+        self.assert_true(np.isnan(window.quantile(0.5)))
+
+
+class TestAuroraBreachDurations(TestBase):
+    """Test threshold-breach duration tracking."""
+
+    def setUp(self):
+        """Set up a series with two CPU spikes."""
+        super().setUp()
+        self.times = np.arange(0, 100, dtype=np.float64)
+        self.values = np.full(len(self.times), 40.0)
+        self.values[10:15] = 95.0
+        self.values[50:80] = 97.0
+
+    def test_streaming_matches_vectorized(self):
+        """Test BreachTracker agrees with the vectorized intervals."""
+        tracker = BreachTracker(threshold=90.0)
+        for t, v in zip(self.times, self.values):
+            tracker.push(t, v)
+        intervals = breach_intervals(self.times, self.values, 90.0)
+        self.assert_equals(2, tracker.count)
+        self.assert_equals(2, len(intervals))
+        self.assertAlmostEqual(30.0, tracker.longest_duration)
+        self.assertAlmostEqual(35.0, tracker.total)
+        self.assertAlmostEqual(30.0, (intervals[:, 1] - intervals[:, 0]).max())
+
+    def test_breach_duration_assertion(self):
+        """Test the TestBase breach-duration assertion."""
+        self.assert_breach_duration_below(self.times, self.values, 90.0, 31.0)
+        with self.assertRaises(AssertionError):
+            self.assert_breach_duration_below(self.times, self.values, 90.0, 30.0)
+
+    def test_vectorized_breach_on_large_series(self):
+        """Test vectorized breach detection over a multi-million sample series."""
+        times = np.arange(5_000_000, dtype=np.float64)
+        values = np.full(len(times), 45.0)
+        values[1_000_000:1_000_120] = 99.0
+        self.assert_breach_duration_below(times, values, 90.0, 300.0)
+
+
+class TestAuroraMetricsEngine(TestBase):
+    """Test the multi-metric engine over Aurora fixture snapshots."""
+
+    def setUp(self):
+        """Set up metrics engine tests."""
+        super().setUp()
+        self.aurora_data = TestFixtures.get_sample_aurora_data()
+
+    def test_ingest_fixture_snapshots(self):
+        """Test repeated fixture snapshots produce healthy summaries."""
+        engine = MetricsEngine(window_seconds=300)
+        for second in range(600):
+            engine.ingest_snapshot(self.aurora_data, float(second))
+        summary = engine.summary()
+        self.assert_equals(600, engine.samples)
+        self.assertAlmostEqual(45.2, summary["cpu_usage"]["mean"])
+        self.assert_true(summary["cpu_usage"]["mean"] < 90)
+        self.assert_equals(0.0, summary["memory_usage"]["longest_breach"])
+        self.assert_equals(300, summary["network_latency"]["samples"])
+
+    def test_missing_readings_skipped(self):
+        """Test NaN and infinite readings are counted and left out of the statistics."""
+        engine = MetricsEngine(window_seconds=60)
+        cpu = [50.0, float("nan"), 95.0, float("inf"), 95.0, 40.0]
+        for second, value in enumerate(cpu):
+            engine.ingest(float(second), {"cpu_usage": value})
+        stats = engine.summary()["cpu_usage"]
+        self.assert_equals(2, stats["skipped"])
+        self.assert_equals(4, stats["samples"])
+        self.assertAlmostEqual(70.0, stats["mean"])
+        self.assertAlmostEqual(95.0, stats["max"])
+        self.assert_equals(1, stats["breach_count"])
+        self.assertAlmostEqual(3.0, stats["longest_breach"])
+
+
+class TestAuroraReportSeries(TestBase):
+    """Test LTTB downsampling and report time-series output."""
+
+    def test_lttb_keeps_endpoints_and_peak(self):
+        """Test downsampling keeps the first, last and extreme points."""
+        times = np.arange(10_000, dtype=np.float64)
+        values = np.sin(times / 500.0)
+        values[4321] = 5.0
+        t_out, v_out = lttb_downsample(times, values, 200)
+        self.assert_equals(200, len(t_out))
+        self.assert_equals(0.0, t_out[0])
+        self.assert_equals(9999.0, t_out[-1])
+        self.assert_true(5.0 in v_out)
+
+    def test_report_includes_downsampled_series(self):
+        """Test the report stores the series and renders an SVG chart."""
+        with tempfile.TemporaryDirectory() as tmp:
+            report = ReportGenerator(output_dir=tmp)
+            times = np.arange(5000, dtype=np.float64)
+            report.add_time_series("cpu_usage", times, np.full(5000, 45.2),
+                                   max_points=100, threshold=90.0)
+            self.assert_equals(100, len(report.time_series["cpu_usage"]["times"]))
+            html = Path(report.save_html_report()).read_text()
+            self.assert_true("<polyline" in html)
+            self.assert_true("cpu_usage" in html)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,113 @@
+"""
+EMQuest Positional Accuracy Regression Tests
+Tests for WGS-84 coordinate conversions and RTK accuracy statistics.
+"""
+
+import unittest
+import sys
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from framework.test_base import TestBase
+from framework.fixtures import TestFixtures
+from framework.geodesy import (
+    WGS84_A, WGS84_E2, accuracy_statistics, geodetic_to_ecef, geodetic_to_enu,
+)
+
+
+class TestGeodeticConversions(TestBase):
+    """Test geodetic, ECEF and ENU conversions."""
+
+    def setUp(self):
+        """Set up conversion tests with the fixture location as reference."""
+        super().setUp()
+        location = TestFixtures.get_sample_emquest_gps_data()["location"]
+        self.reference = (location["latitude"], location["longitude"],
+                          location["altitude"])
+
+    def test_ecef_known_points(self):
+        """Test ECEF coordinates of the equator/prime meridian and the pole."""
+        x, y, z = geodetic_to_ecef(np.array([0.0, 90.0]), np.array([0.0, 0.0]),
+                                   np.array([0.0, 0.0]))
+        self.assertAlmostEqual(WGS84_A, x[0], places=6)
+        self.assertAlmostEqual(0.0, y[0], places=6)
+        self.assertAlmostEqual(6356752.314245, z[1], places=5)
+
+    def test_reference_maps_to_origin(self):
+        """Test the reference station is the ENU origin."""
+        east, north, up = geodetic_to_enu(*self.reference, self.reference)
+        for value in (east, north, up):
+            self.assertAlmostEqual(0.0, float(value), places=6)
+
+    def test_altitude_offset_is_up(self):
+        """Test a pure altitude change maps to the up axis."""
+        lat, lon, alt = self.reference
+        east, north, up = geodetic_to_enu(lat, lon, alt + 10.0, self.reference)
+        self.assertAlmostEqual(0.0, float(east), places=6)
+        self.assertAlmostEqual(0.0, float(north), places=6)
+        self.assertAlmostEqual(10.0, float(up), places=6)
+
+    def test_latitude_offset_is_north(self):
+        """Test a small latitude change maps to the north axis."""
+        lat, lon, alt = self.reference
+        meridian_radius = (WGS84_A * (1 - WGS84_E2)
+                           / (1 - WGS84_E2 * np.sin(np.radians(lat)) ** 2) ** 1.5)
+        dlat = np.degrees(100.0 / (meridian_radius + alt))
+        east, north, up = geodetic_to_enu(lat + dlat, lon, alt, self.reference)
+        self.assertAlmostEqual(100.0, float(north), places=3)
+        self.assertAlmostEqual(0.0, float(east), places=6)
+
+
+class TestRTKAccuracyStatistics(TestBase):
+    """Test per-fix-quality accuracy statistics."""
+
+    def setUp(self):
+        """Set up 200k simulated fixes with class-specific noise."""
+        super().setUp()
+        rng = np.random.default_rng(42)
+        self.sigmas = {"RTK Fixed": 0.02, "RTK Float": 0.3, "DGPS": 1.0}
+        labels = np.array(list(self.sigmas))
+        self.quality = labels[rng.integers(0, len(labels), 200_000)]
+        sigma = np.select([self.quality == k for k in self.sigmas],
+                          list(self.sigmas.values()))
+        self.east = rng.normal(0, 1, len(sigma)) * sigma
+        self.north = rng.normal(0, 1, len(sigma)) * sigma
+        self.up = rng.normal(0, 1, len(sigma)) * sigma * 1.5
+        self.stats = accuracy_statistics(self.east, self.north, self.up, self.quality)
+
+    def test_classes_and_counts(self):
+        """Test every fix quality class is reported with its count."""
+        self.assert_equals(set(self.sigmas), set(self.stats))
+        total = sum(s["count"] for s in self.stats.values())
+        self.assert_equals(200_000, total)
+
+    def test_rms_matches_noise_model(self):
+        """Test horizontal/vertical RMS and 2DRMS follow the noise sigma."""
+        for label, sigma in self.sigmas.items():
+            stats = self.stats[label]
+            self.assertAlmostEqual(sigma * np.sqrt(2), stats["horizontal_rms"],
+                                   delta=0.01 * sigma)
+            self.assertAlmostEqual(sigma * 1.5, stats["vertical_rms"], delta=0.01 * sigma)
+            self.assertAlmostEqual(2 * stats["horizontal_rms"], stats["2drms"])
+
+    def test_percentiles_match_numpy(self):
+        """Test CEP and R95 match per-class numpy quantiles."""
+        horizontal = np.hypot(self.east, self.north)
+        for label in self.sigmas:
+            errors = horizontal[self.quality == label]
+            self.assertAlmostEqual(np.quantile(errors, 0.5), self.stats[label]["cep"])
+            self.assertAlmostEqual(np.quantile(errors, 0.95), self.stats[label]["r95"])
+
+    def test_rtk_fixed_beats_float(self):
+        """Test RTK Fixed accuracy is tighter than RTK Float and DGPS."""
+        fixed, rtk_float = self.stats["RTK Fixed"], self.stats["RTK Float"]
+        self.assert_true(fixed["r95"] < rtk_float["cep"])
+        self.assert_true(rtk_float["r95"] < self.stats["DGPS"]["r95"])
+        self.assert_true(fixed["2drms"] < 0.1, "RTK Fixed 2DRMS should be < 10 cm")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,158 @@
+"""
+EMQuest Filtered Output Regression Tests
+Tests for batched constant-velocity Kalman filtering and RTS smoothing.
+"""
+
+import unittest
+import sys
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from framework.test_base import TestBase
+from framework.fixtures import TestFixtures
+from framework.geodesy import geodetic_to_enu
+from framework.kalman import kalman_filter, rts_smooth
+
+
+def _drive(samples: int, seed: int = 0):
+    """Simulated drive near the fixture location: times, true ENU, noisy ENU, accuracy."""
+    rng = np.random.default_rng(seed)
+    location = TestFixtures.get_sample_emquest_gps_data()["location"]
+    times = np.cumsum(rng.uniform(0.5, 1.5, samples))
+    heading = np.cumsum(rng.normal(0, 0.05, samples))
+    step = 10.0 * np.diff(times, prepend=times[0])
+    latitude = location["latitude"] + np.cumsum(step * np.cos(heading)) / 111_320
+    longitude = location["longitude"] + np.cumsum(step * np.sin(heading)) / 96_200
+    east, north, _ = geodetic_to_enu(latitude, longitude, np.full(samples, location["altitude"]),
+                                     (location["latitude"], location["longitude"],
+                                      location["altitude"]))
+    truth = np.stack([east, north], axis=-1)
+    accuracy = rng.uniform(location["accuracy"] / 2, location["accuracy"] * 2, samples)
+    measured = truth + rng.normal(0, 1, truth.shape) * accuracy[:, None]
+    return times, truth, measured, accuracy
+
+
+def _reference(times, measured, accuracy, process_noise=1.0, initial_velocity_std=10.0):
+    """Textbook sequential Kalman filter and RTS smoother for one trace."""
+    state = np.zeros((2, measured.shape[1]))
+    state[0] = measured[0]
+    cov = np.diag([accuracy[0] ** 2, initial_velocity_std ** 2])
+    filtered, filtered_cov, predicted, predicted_cov, transitions = [state], [cov], [], [], []
+    for k in range(1, len(times)):
+        dt = times[k] - times[k - 1]
+        f = np.array([[1.0, dt], [0.0, 1.0]])
+        q = process_noise * np.array([[dt ** 3 / 3, dt ** 2 / 2], [dt ** 2 / 2, dt]])
+        state, cov = f @ state, f @ cov @ f.T + q
+        predicted.append(state)
+        predicted_cov.append(cov)
+        transitions.append(f)
+        if np.isfinite(accuracy[k]) and np.isfinite(measured[k]).all():
+            gain = cov[:, 0] / (cov[0, 0] + accuracy[k] ** 2)
+            state = state + np.outer(gain, measured[k] - state[0])
+            cov = cov - np.outer(gain, cov[0])
+        filtered.append(state)
+        filtered_cov.append(cov)
+
+    smoothed, smoothed_cov = [filtered[-1]], [filtered_cov[-1]]
+    for k in range(len(times) - 2, -1, -1):
+        g = filtered_cov[k] @ transitions[k].T @ np.linalg.inv(predicted_cov[k])
+        smoothed.insert(0, filtered[k] + g @ (smoothed[0] - predicted[k]))
+        smoothed_cov.insert(0, filtered_cov[k]
+                            + g @ (smoothed_cov[0] - predicted_cov[k]) @ g.T)
+    return (np.array(filtered), np.array(filtered_cov),
+            np.array(smoothed), np.array(smoothed_cov))
+
+
+class TestKalmanAgainstReference(TestBase):
+    """Test scan-based outputs against the sequential filter and smoother."""
+
+    def setUp(self):
+        """Set up a drive with dropouts and a repeated timestamp."""
+        super().setUp()
+        self.times, _, self.measured, self.accuracy = _drive(400)
+        self.times[50] = self.times[49]
+        self.accuracy[[100, 101, 102]] = np.nan
+        self.measured[250] = np.nan
+        self.expected = _reference(self.times, self.measured, self.accuracy)
+
+    def test_filter_matches_reference(self):
+        """Test filtered states and covariances match the sequential filter."""
+        result = kalman_filter(self.times, self.measured, self.accuracy)
+        filtered, filtered_cov, _, _ = self.expected
+        self.assert_true(np.allclose(filtered[:, 0], result["position"], atol=1e-9))
+        self.assert_true(np.allclose(filtered[:, 1], result["velocity"], atol=1e-9))
+        self.assert_true(np.allclose(filtered_cov, result["covariance"], atol=1e-9))
+
+    def test_smoother_matches_reference(self):
+        """Test smoothed states and covariances match the sequential RTS smoother."""
+        result = rts_smooth(self.times, self.measured, self.accuracy)
+        _, _, smoothed, smoothed_cov = self.expected
+        self.assert_true(np.allclose(smoothed[:, 0], result["position"], atol=1e-9))
+        self.assert_true(np.allclose(smoothed[:, 1], result["velocity"], atol=1e-9))
+        self.assert_true(np.allclose(smoothed_cov, result["covariance"], atol=1e-9))
+
+    def test_chunk_size_does_not_change_output(self):
+        """Test the blocked scan is exact for any chunk length."""
+        baseline = rts_smooth(self.times, self.measured, self.accuracy, chunk_size=1)
+        for chunk_size in (7, 64, 400, 1000):
+            result = rts_smooth(self.times, self.measured, self.accuracy,
+                                chunk_size=chunk_size)
+            self.assert_true(np.allclose(baseline["position"], result["position"],
+                                         atol=1e-9), f"chunk_size={chunk_size}")
+
+
+class TestKalmanBatches(TestBase):
+    """Test batched traces and filtered-output properties."""
+
+    def test_batch_matches_individual_traces(self):
+        """Test smoothing many traces at once equals smoothing each one."""
+        drives = [_drive(300, seed) for seed in range(4)]
+        times = np.stack([d[0] for d in drives])
+        measured = np.stack([d[2] for d in drives])
+        accuracy = np.stack([d[3] for d in drives])
+        batch = rts_smooth(times, measured, accuracy)
+        self.assert_equals((4, 300, 2), batch["position"].shape)
+        for i in range(4):
+            single = rts_smooth(times[i], measured[i], accuracy[i])
+            self.assert_true(np.allclose(single["position"], batch["position"][i]))
+            self.assert_true(np.allclose(single["covariance"], batch["covariance"][i]))
+
+    def test_smoothing_reduces_error(self):
+        """Test smoothed positions beat raw and filtered fixes on a long drive."""
+        times, truth, measured, accuracy = _drive(50_000)
+        filtered = kalman_filter(times, measured, accuracy)
+        smoothed = rts_smooth(times, measured, accuracy)
+
+        def rms(positions):
+            return np.sqrt(np.mean(np.sum((positions - truth) ** 2, axis=-1)))
+
+        self.assert_true(rms(smoothed["position"]) < rms(filtered["position"])
+                         < rms(measured))
+        self.assert_true((smoothed["covariance"][:, 0, 0]
+                          <= filtered["covariance"][:, 0, 0] + 1e-9).all())
+        self.assert_true(np.allclose(smoothed["position"][-1], filtered["position"][-1]))
+
+    def test_single_axis_shape(self):
+        """Test one-axis positions come back without a trailing axis."""
+        result = rts_smooth(np.arange(10.0), np.arange(10.0), np.ones(10))
+        self.assert_equals((10,), result["position"].shape)
+        self.assert_equals((10, 2, 2), result["covariance"].shape)
+
+    def test_invalid_inputs(self):
+        """Test malformed traces are rejected."""
+        times, accuracy = np.arange(5.0), np.ones(5)
+        with self.assertRaises(ValueError):
+            kalman_filter(times[::-1], np.zeros(5), accuracy)
+        with self.assertRaises(ValueError):
+            kalman_filter(times, np.zeros(5), np.array([np.nan, 1, 1, 1, 1]))
+        with self.assertRaises(ValueError):
+            kalman_filter(times, np.zeros(5), np.zeros(5))
+        with self.assertRaises(ValueError):
+            kalman_filter(times, np.zeros(4), accuracy)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,151 @@
+"""
+EMQuest NMEA Log Parsing Regression Tests
+Tests for the streaming NMEA 0183 parser that feeds GPS tests from receiver logs.
+"""
+
+import os
+import tempfile
+import time
+import unittest
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from framework.test_base import TestBase
+from framework.fixtures import TestFixtures
+from framework.nmea_parser import NMEAStreamParser, nmea_checksum, to_fixture_records
+
+
+class TestNMEAChecksums(TestBase):
+    """Test bulk NMEA checksum validation."""
+
+    def setUp(self):
+        """Set up checksum tests."""
+        super().setUp()
+        self.log = TestFixtures.get_sample_nmea_log()
+
+    def test_nmea_checksum_value(self):
+        """Test checksum of a known sentence body."""
+        self.assert_equals(0x31, nmea_checksum(
+            "GPGSA,A,3,02,05,07,09,13,15,18,20,24,27,29,30,1.6,0.9,1.3"))
+
+    def test_nmea_valid_log_has_no_errors(self):
+        """Test a clean log parses without checksum errors."""
+        parser = NMEAStreamParser()
+        parser.parse_bytes(self.log)
+        self.assert_equals(7, parser.sentences)
+        self.assert_equals(0, parser.checksum_errors)
+        self.assert_equals(0, parser.malformed)
+
+    def test_nmea_corrupted_sentence_rejected(self):
+        """Test sentences with a bad checksum are dropped and counted."""
+        corrupted = self.log.replace(b"250.5,M", b"259.5,M")
+        parser = NMEAStreamParser()
+        batch = parser.parse_bytes(corrupted)
+        self.assert_equals(1, parser.checksum_errors)
+        self.assert_equals(2, len(batch["GGA"]["latitude"]))
+
+    def test_nmea_invalid_hex_digit_rejected(self):
+        """Test a checksum with a non-hex digit never validates."""
+        # "*1G" would decode as 0x10 - 1 == 0x0F if the invalid digit counted as -1.
+        body = "GPTXT,01,01,01,probe 29"
+        self.assert_equals(0x0F, nmea_checksum(body))
+        parser = NMEAStreamParser()
+        parser.parse_bytes(f"${body}*1G\r\n".encode())
+        self.assert_equals(1, parser.checksum_errors)
+
+    def test_nmea_malformed_lines_counted(self):
+        """Test lines without framing are counted as malformed."""
+        parser = NMEAStreamParser()
+        parser.parse_bytes(b"garbage line\n" + self.log + b"$GPGGA,no-star\n")
+        self.assert_equals(2, parser.malformed)
+
+
+class TestNMEAFixBatches(TestBase):
+    """Test columnar fix batches decoded from NMEA sentences."""
+
+    def setUp(self):
+        """Set up batch tests."""
+        super().setUp()
+        self.batch = NMEAStreamParser().parse_bytes(TestFixtures.get_sample_nmea_log())
+
+    def test_gga_fix_quality_labels(self):
+        """Test GGA quality codes map to fixture fix_quality labels."""
+        self.assert_equals(["RTK Fixed", "RTK Float", "DGPS"],
+                           self.batch["GGA"]["fix_quality"].tolist())
+
+    def test_gga_coordinates(self):
+        """Test GGA coordinates convert to signed decimal degrees."""
+        gga = self.batch["GGA"]
+        self.assertAlmostEqual(30.2672, gga["latitude"][0], places=4)
+        self.assertAlmostEqual(-97.7431, gga["longitude"][0], places=4)
+        self.assertAlmostEqual(250.5, gga["altitude"][0])
+
+    def test_gga_timestamp_uses_rmc_date(self):
+        """Test GGA timestamps combine time of day with the latest RMC date."""
+        gga = self.batch["GGA"]
+        expected = 20527 * 86400 + 18 * 3600 + 30 * 60  # 2026-03-15 18:30:00Z
+        self.assertAlmostEqual(expected, gga["timestamp"][0])
+        self.assertAlmostEqual(2.0, gga["timestamp"][2] - gga["timestamp"][0])
+
+    def test_gsa_and_gsv_columns(self):
+        """Test GSA dilution values and GSV satellite blocks."""
+        gsa, gsv = self.batch["GSA"], self.batch["GSV"]
+        self.assert_equals(12, int(gsa["satellites_used"][0]))
+        self.assertAlmostEqual(0.9, gsa["hdop"][0])
+        self.assert_equals(12, int(gsv["satellites_in_view"][0]))
+        self.assert_equals([2, 5, 7, 9], gsv["prn"][0].tolist())
+        self.assert_equals([44.0, 41.0, 47.0, 38.0], gsv["snr"][0].tolist())
+
+    def test_fixture_records_pass_gps_checks(self):
+        """Test converted fixes satisfy the EMQuest fixture assertions."""
+        for record in to_fixture_records(self.batch["GGA"]):
+            location = record["location"]
+            self.assert_true(-90 <= location["latitude"] <= 90)
+            self.assert_true(0 < location["accuracy"] <= 100)
+            self.assert_true(record["satellites"] >= 4)
+            self.assert_true(record["timestamp"].startswith("2026-03-15T18:30"))
+
+
+class TestNMEAStreaming(TestBase):
+    """Test chunked streaming across chunk boundaries."""
+
+    def test_stream_small_chunks_matches_single_pass(self):
+        """Test tiny chunks split mid-sentence give identical results."""
+        log = TestFixtures.get_sample_nmea_log() * 50
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "drive.nmea")
+            with open(path, "wb") as f:
+                f.write(log)
+            batches = list(NMEAStreamParser(chunk_size=97).parse_file(path))
+        streamed = sum(len(b["GGA"]["latitude"]) for b in batches if "GGA" in b)
+        self.assert_equals(150, streamed)
+
+    def test_stream_unterminated_last_line(self):
+        """Test a final sentence without a newline is still parsed."""
+        log = TestFixtures.get_sample_nmea_log().rstrip(b"\r\n")
+        batch = NMEAStreamParser().parse_bytes(log)
+        self.assert_equals(3, len(batch["GGA"]["latitude"]))
+
+
+@unittest.skipUnless(os.environ.get("REGRESSION_BENCHMARKS"),
+                     "wall-clock benchmark; set REGRESSION_BENCHMARKS=1 to run")
+class TestNMEAThroughput(TestBase):
+    """Guard bulk parsing throughput against regressions."""
+
+    def test_parse_throughput_floor(self):
+        """Test a large log parses at a conservative sentences-per-second floor."""
+        log = TestFixtures.get_sample_nmea_log() * 20_000
+        parser = NMEAStreamParser()
+        started = time.perf_counter()
+        batch = parser.parse_bytes(log)
+        elapsed = time.perf_counter() - started
+        self.assert_equals(60_000, len(batch["GGA"]["latitude"]))
+        # Measured at roughly 0.6M sentences/s; the floor leaves room for slow CI.
+        self.assert_true(parser.sentences / elapsed > 100_000,
+                         f"{parser.sentences / elapsed:,.0f} sentences/s")
+
+
+if __name__ == "__main__":
+    unittest.main()
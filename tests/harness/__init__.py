@@ -0,0 +1 @@
+"""Test harness tooling regression tests."""
@@ -0,0 +1,47 @@
+"""
+Throwaway project trees for the watch daemon and distributed runner tests.
+"""
+
+import os
+import sys
+import tempfile
+import textwrap
+from pathlib import Path
+from typing import List
+
+
+class ScratchProject:
+    """Temporary project directory holding uniquely named packages."""
+
+    _counter = 0
+
+    def __init__(self):
+        """Create the temporary project root."""
+        self._tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self._tmp.name)
+        self.packages: List[str] = []
+
+    def package_name(self, prefix: str) -> str:
+        """Reserve a package name unique to this process and project."""
+        ScratchProject._counter += 1
+        name = f"{prefix}_{os.getpid()}_{ScratchProject._counter}"
+        self.packages.append(name)
+        return name
+
+    def write(self, relative: str, source: str):
+        """Write dedented ``source`` to ``relative`` under the project root."""
+        path = self.root / relative
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(textwrap.dedent(source))
+        # Bump mtime explicitly so coarse filesystem clocks still see a change.
+        stat = path.stat()
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+    def cleanup(self):
+        """Unload the project's modules, drop it from sys.path and delete it."""
+        for name in list(sys.modules):
+            if name.split(".")[0] in self.packages:
+                del sys.modules[name]
+        while str(self.root) in sys.path:
+            sys.path.remove(str(self.root))
+        self._tmp.cleanup()
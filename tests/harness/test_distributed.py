@@ -0,0 +1,292 @@
+"""
+Distributed Runner Regression Tests
+Tests for lease scheduling, work stealing, re-queueing and loopback workers.
+"""
+
+import os
+import sys
+import tempfile
+import time
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from framework.test_base import TestBase
+from framework.report_generator import ReportGenerator
+from framework.distributed import Coordinator, Worker, discover_test_ids, run_local_workers
+from tests.harness.scratch_project import ScratchProject
+
+
+def _ids(prefix: str, classes: int, tests: int):
+    """Synthetic test IDs: ``classes`` classes with ``tests`` tests each."""
+    return [f"{prefix}.TestC{c}.test_{t}" for c in range(classes) for t in range(tests)]
+
+
+class TestLeaseScheduling(TestBase):
+    """Test coordinator scheduling without sockets."""
+
+    def test_groups_then_steals(self):
+        """Test idle workers take class groups, then steal half a busy queue."""
+        coordinator = Coordinator(_ids("m", 1, 8))
+        coordinator.register("a")
+        coordinator.register("b")
+        lease = coordinator.next_test("a")
+        self.assert_equals("m.TestC0.test_0", lease["test_id"])
+        lease = coordinator.next_test("b")
+        # b stole the tail half of a's seven queued tests.
+        self.assert_equals("m.TestC0.test_4", lease["test_id"])
+        self.assert_equals(3, len(coordinator._workers["a"].queue))
+        self.assert_equals(3, len(coordinator._workers["b"].queue))
+
+    def test_results_finish_run(self):
+        """Test completing every lease shuts workers down."""
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        report = ReportGenerator(output_dir=tmp.name)
+        coordinator = Coordinator(_ids("m", 2, 2), report=report)
+        coordinator.register("a")
+        reply = coordinator.next_test("a")
+        while reply["type"] == "lease":
+            test_id = reply["test_id"]
+            coordinator.complete("a", test_id, [{"test_name": test_id, "passed": True,
+                                                 "duration": 0.0, "error": ""}])
+            reply = coordinator.next_test("a")
+        self.assert_equals("shutdown", reply["type"])
+        self.assert_true(coordinator.wait(0))
+        self.assert_equals(4, report.generate_summary()["passed"])
+
+    def test_lease_marks_last_of_class(self):
+        """Test leases flag the last queued test of each class."""
+        coordinator = Coordinator(_ids("m", 2, 2))
+        coordinator.register("a")
+        flags = []
+        reply = coordinator.next_test("a")
+        while reply["type"] == "lease":
+            flags.append(reply["last_in_class"])
+            coordinator.complete("a", reply["test_id"], [])
+            reply = coordinator.next_test("a")
+        self.assert_equals([False, True, False, True], flags)
+
+    def test_silent_worker_requeued(self):
+        """Test a worker that stops heartbeating loses its lease and queue."""
+        coordinator = Coordinator(_ids("m", 1, 4), heartbeat_timeout=5.0)
+        coordinator.register("a")
+        coordinator.next_test("a")
+        coordinator.reap(now=time.monotonic() + 10.0)
+        self.assert_equals({}, coordinator._workers)
+        coordinator.register("b")
+        self.assert_equals("m.TestC0.test_0", coordinator.next_test("b")["test_id"])
+        self.assert_equals(3, len(coordinator._workers["b"].queue))
+
+    def test_repeatedly_lost_test_fails(self):
+        """Test a test lost max_attempts times is reported as failed."""
+        coordinator = Coordinator(["m.TestC0.test_crash"], max_attempts=2)
+        for worker in ("a", "b"):
+            coordinator.register(worker)
+            coordinator.next_test(worker)
+            coordinator.drop_worker(worker, "connection closed")
+        self.assert_true(coordinator.wait(0))
+        self.assert_false(coordinator.results[0]["passed"])
+        self.assert_true("lost 2 times" in coordinator.results[0]["error"])
+
+
+class TestLoopbackWorkers(TestBase):
+    """Test a coordinator with real worker processes over loopback TCP."""
+
+    def setUp(self):
+        """Create a temporary project with a suite that crashes and hangs once."""
+        super().setUp()
+        self.project = ScratchProject()
+        self.suite = self.project.package_name("dist_suite")
+        self.project.write(f"{self.suite}/__init__.py", "")
+        self.project.write(f"{self.suite}/test_work.py", f"""
+            import os
+            import time
+            import unittest
+
+            MARKERS = {str(self.project.root)!r}
+
+            def first_attempt(name):
+                path = os.path.join(MARKERS, name + ".marker")
+                if os.path.exists(path):
+                    return False
+                open(path, "w").close()
+                return True
+
+            class TestFast(unittest.TestCase):
+                pass
+
+            for i in range(12):
+                setattr(TestFast, f"test_{{i:02d}}", lambda self: None)
+
+            class TestFlaky(unittest.TestCase):
+                def test_crashes_worker_once(self):
+                    if first_attempt("crash"):
+                        os._exit(1)
+
+                def test_hangs_once(self):
+                    if first_attempt("hang") and os.environ.get("DIST_HANG"):
+                        time.sleep(30)
+
+                def test_reports_failure(self):
+                    self.assertEqual(1, 2)
+            """)
+
+    def tearDown(self):
+        """Remove the project."""
+        self.project.cleanup()
+        super().tearDown()
+
+    def _run(self, workers: int, **options):
+        report = ReportGenerator(output_dir=str(self.project.root / "reports"))
+        test_ids = discover_test_ids(str(self.project.root), self.suite)
+        coordinator = Coordinator(test_ids, report=report, heartbeat_timeout=5.0, **options)
+        coordinator.start()
+        finished = run_local_workers(coordinator, workers, str(self.project.root),
+                                     heartbeat_interval=0.1, timeout=60)
+        self.assert_true(finished, "distributed run did not finish")
+        return test_ids, coordinator, report
+
+    def test_discovery(self):
+        """Test test IDs are discovered from the suite package."""
+        test_ids = discover_test_ids(str(self.project.root), self.suite)
+        self.assert_equals(15, len(test_ids))
+        self.assert_true(f"{self.suite}.test_work.TestFlaky.test_hangs_once" in test_ids)
+
+    def test_class_setup_failure_and_empty_lease_fail(self):
+        """Test a setUpClass error or a lease that runs nothing reports a failure."""
+        self.project.write(f"{self.suite}/broken.py", """
+            import unittest
+
+            class TestNeedsFixture(unittest.TestCase):
+                @classmethod
+                def setUpClass(cls):
+                    raise RuntimeError("fixture unavailable")
+
+                def test_uses_fixture(self):
+                    pass
+            """)
+        worker = Worker(("127.0.0.1", 0), root=str(self.project.root))
+        sys.path.insert(0, worker.root)
+        try:
+            test_id = f"{self.suite}.broken.TestNeedsFixture.test_uses_fixture"
+            records = worker.run_test(test_id)
+            empty = worker.run_test(f"{self.suite}")
+        finally:
+            sys.path.remove(worker.root)
+        self.assert_equals([test_id], [r["test_name"] for r in records])
+        self.assert_false(records[0]["passed"])
+        self.assert_true("setUpClass" in records[0]["error"])
+        self.assert_true("fixture unavailable" in records[0]["error"])
+        self.assert_equals([self.suite], [r["test_name"] for r in empty])
+        self.assert_false(empty[0]["passed"])
+
+    def test_class_fixture_kept_across_leases(self):
+        """Test setUpClass runs once for consecutive leases of a class."""
+        self.project.write(f"{self.suite}/shared.py", """
+            import unittest
+
+            CALLS = []
+
+            class TestShared(unittest.TestCase):
+                @classmethod
+                def setUpClass(cls):
+                    CALLS.append("setUpClass")
+
+                @classmethod
+                def tearDownClass(cls):
+                    CALLS.append("tearDownClass")
+
+                def test_a(self):
+                    pass
+
+                def test_b(self):
+                    pass
+
+            class TestBrokenTeardown(unittest.TestCase):
+                @classmethod
+                def tearDownClass(cls):
+                    raise RuntimeError("teardown failed")
+
+                def test_only(self):
+                    pass
+            """)
+        worker = Worker(("127.0.0.1", 0), root=str(self.project.root))
+        sys.path.insert(0, worker.root)
+        shared = f"{self.suite}.shared.TestShared"
+        worker.run_test(f"{shared}.test_a", last_in_class=False)
+        worker.run_test(f"{shared}.test_b", last_in_class=False)
+        calls = sys.modules[f"{self.suite}.shared"].CALLS
+        self.assert_equals(["setUpClass"], calls)
+
+        # Moving to another class tears the previous one down first.
+        broken = f"{self.suite}.shared.TestBrokenTeardown.test_only"
+        records = worker.run_test(broken, last_in_class=False)
+        self.assert_equals(["setUpClass", "tearDownClass"], calls)
+        self.assert_equals([(broken, True)], [(r["test_name"], r["passed"]) for r in records])
+
+        # The last lease of a class releases it; teardown errors keep their name.
+        records = worker.run_test(f"{shared}.test_a", last_in_class=True)
+        self.assert_equals(["setUpClass", "tearDownClass"] * 2, calls)
+        failed = [r for r in records if not r["passed"]]
+        self.assert_equals(1, len(failed))
+        self.assert_true(failed[0]["test_name"].startswith("tearDownClass ("))
+        self.assert_true("teardown failed" in failed[0]["error"])
+        self.assert_equals([], worker.release_fixtures())
+
+    def test_workers_merge_results_and_recover_crash(self):
+        """Test every test reports once and a crashed worker's test is re-run."""
+        test_ids, coordinator, report = self._run(3)
+        names = [r["test_name"] for r in coordinator.results]
+        self.assert_equals(sorted(test_ids), sorted(names))
+        summary = report.generate_summary()
+        self.assert_equals(14, summary["passed"])
+        self.assert_equals(1, summary["failed"])
+        self.assert_true(len({r["worker"] for r in coordinator.results}) >= 2)
+
+    def test_single_worker_restarted_after_crash(self):
+        """Test a lone worker killed by a test is restarted and the run finishes."""
+        self.project.write(f"{self.suite}/test_work.py", """
+            import os
+            import unittest
+
+            class TestCrash(unittest.TestCase):
+                def test_always_crashes(self):
+                    os._exit(1)
+
+                def test_passes(self):
+                    pass
+            """)
+        _, coordinator, report = self._run(1, max_attempts=2)
+        results = {r["test_name"].rsplit(".", 1)[1]: r for r in coordinator.results}
+        self.assert_false(results["test_always_crashes"]["passed"])
+        self.assert_true("lost 2 times" in results["test_always_crashes"]["error"])
+        self.assert_true(results["test_passes"]["passed"])
+        self.assert_equals(2, report.generate_summary()["total_tests"])
+
+    def test_no_workers_left_fails_remaining(self):
+        """Test the run ends with failures when no worker can ever connect."""
+        coordinator = Coordinator(_ids("m", 1, 3))  # never started: workers cannot connect
+        finished = run_local_workers(coordinator, 1, str(self.project.root), timeout=60)
+        self.assert_true(finished)
+        self.assert_equals(3, len(coordinator.results))
+        self.assert_true(all("no workers left" in r["error"] for r in coordinator.results))
+
+    def test_lease_timeout_requeues_hung_test(self):
+        """Test a test that overruns its lease is re-run on another worker."""
+        os.environ["DIST_HANG"] = "1"
+        try:
+            started = time.perf_counter()
+            _, coordinator, report = self._run(3, lease_timeout=2.0)
+        finally:
+            del os.environ["DIST_HANG"]
+        self.assert_true(time.perf_counter() - started < 30)
+        hang = [r for r in coordinator.results if r["test_name"].endswith("test_hangs_once")]
+        self.assert_equals(1, len(hang))
+        self.assert_true(hang[0]["passed"])
+        self.assert_equals(14, report.generate_summary()["passed"])
+
+
+if __name__ == "__main__":
+    unittest.main()
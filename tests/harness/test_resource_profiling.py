@@ -0,0 +1,156 @@
+"""
+Resource Profiling Regression Tests
+Tests for opt-in per-test resource profiling in TestBase and the report.
+"""
+
+import os
+import tempfile
+import tracemalloc
+import unittest
+import sys
+from pathlib import Path
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from framework.test_base import TestBase
+from framework.profiling import ResourceProfiler, is_sampled
+from framework.report_generator import ReportGenerator
+
+
+def _example_cases():
+    """Build the profiled and unprofiled cases run from within the tests below.
+
+    They are created on demand so pytest and unittest discovery never
+    collect them as tests of their own.
+    """
+
+    class ProfiledExample(TestBase):
+        """Profiled test case that traces every test."""
+
+        profile_resources = True
+        profile_sample_rate = 1.0
+
+        def test_allocate(self):
+            """Allocate a few megabytes."""
+            self.blob = [bytearray(1024) for _ in range(4096)]
+            self.assert_true(len(self.blob) > 0)
+
+        def test_spin(self):
+            """Burn a little CPU."""
+            self.assert_true(sum(i * i for i in range(200_000)) > 0)
+
+    class UnprofiledExample(TestBase):
+        """Test case without profiling enabled."""
+
+        def test_noop(self):
+            """Do nothing."""
+            self.assert_true(True)
+
+    class FailingSetUpExample(ProfiledExample):
+        """Profiled test case whose setUp fails after profiling has started."""
+
+        def setUp(self):
+            super().setUp()
+            raise RuntimeError("fixture unavailable")
+
+    return ProfiledExample, UnprofiledExample, FailingSetUpExample
+
+
+def _run(case: type) -> unittest.TestResult:
+    suite = unittest.TestLoader().loadTestsFromTestCase(case)
+    result = unittest.TestResult()
+    suite.run(result)
+    return result
+
+
+class TestResourceProfiler(TestBase):
+    """Test the standalone profiler."""
+
+    def test_profile_fields(self):
+        """Test every resource field is captured."""
+        profiler = ResourceProfiler()
+        profiler.start()
+        data = [bytearray(1024) for _ in range(2048)]
+        profile = profiler.stop()
+        self.assert_true(len(data) > 0)
+        self.assert_true(profile["cpu_time"] >= 0)
+        self.assert_true(profile["peak_alloc_bytes"] >= 2048 * 1024)
+        self.assert_true(profile["gc_collections"] >= 0)
+        self.assert_true("rss_delta_bytes" in profile)
+
+    def test_untraced_profile_skips_tracemalloc(self):
+        """Test unsampled runs skip allocation tracing."""
+        profiler = ResourceProfiler(trace_allocations=False)
+        profiler.start()
+        profile = profiler.stop()
+        self.assert_equals(None, profile["peak_alloc_bytes"])
+
+    def test_sampling_is_deterministic(self):
+        """Test sampling picks the same tests each time at the given rate."""
+        ids = [f"tests.module.TestCase.test_{i}" for i in range(2000)]
+        picked = [i for i in ids if is_sampled(i, 0.25)]
+        self.assert_equals(picked, [i for i in ids if is_sampled(i, 0.25)])
+        self.assertAlmostEqual(0.25, len(picked) / len(ids), delta=0.05)
+
+
+class TestBaseProfilingHooks(TestBase):
+    """Test TestBase hooks and report integration."""
+
+    def setUp(self):
+        """Clear recorded profiles."""
+        super().setUp()
+        self._saved_profiles = dict(TestBase.resource_profiles)
+        TestBase.resource_profiles.clear()
+        self.profiled, self.unprofiled, self.failing_setup = _example_cases()
+
+    def tearDown(self):
+        """Restore recorded profiles."""
+        TestBase.resource_profiles.clear()
+        TestBase.resource_profiles.update(self._saved_profiles)
+        super().tearDown()
+
+    def test_opt_in_class_records_profiles(self):
+        """Test a profiled class records one profile per test."""
+        self.assert_true(_run(self.profiled).wasSuccessful())
+        names = sorted(TestBase.resource_profiles)
+        self.assert_equals(2, len(names))
+        allocate = next(p for n, p in TestBase.resource_profiles.items()
+                        if n.endswith("test_allocate"))
+        self.assert_true(allocate["peak_alloc_bytes"] >= 4096 * 1024)
+
+    def test_failed_setup_stops_profiler(self):
+        """Test a setUp that raises after super().setUp() still stops tracemalloc."""
+        if tracemalloc.is_tracing():
+            self.skipTest("tracemalloc already enabled by the caller")
+        result = _run(self.failing_setup)
+        self.assert_equals(2, len(result.errors))
+        self.assert_false(tracemalloc.is_tracing())
+        self.assert_equals(2, len(TestBase.resource_profiles))
+
+    def test_profiling_off_by_default(self):
+        """Test classes that do not opt in record nothing."""
+        with mock.patch.dict(os.environ):
+            os.environ.pop("REGRESSION_PROFILE", None)
+            _run(self.unprofiled)
+        self.assert_equals({}, TestBase.resource_profiles)
+
+    def test_report_columns_and_top_tables(self):
+        """Test profiles are stored with results and shown in the HTML report."""
+        _run(self.profiled)
+        with tempfile.TemporaryDirectory() as tmp:
+            report = ReportGenerator(output_dir=tmp)
+            for name in TestBase.resource_profiles:
+                report.add_test_result(name, True, 0.01)
+            report.add_test_result("tests.other.TestX.test_unprofiled", True, 0.01)
+            report.attach_resource_profiles(TestBase.resource_profiles)
+            top = report.top_resource_users("peak_alloc_bytes", n=1)
+            html = Path(report.save_html_report()).read_text()
+        self.assert_true(top[0]["test_name"].endswith("test_allocate"))
+        self.assert_true("Peak Alloc (KiB)" in html)
+        self.assert_true("Top 10 by CPU (s)" in html)
+        self.assert_true("sortTable" in html)
+
+
+if __name__ == "__main__":
+    unittest.main()
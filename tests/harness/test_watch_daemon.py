@@ -0,0 +1,123 @@
+"""
+Watch Daemon Regression Tests
+Tests for module dependency tracking, reloads and forked warm-worker reruns.
+"""
+
+import sys
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from framework.test_base import TestBase
+from framework.report_generator import ReportGenerator
+from framework.watch_daemon import WatchDaemon
+from tests.harness.scratch_project import ScratchProject
+
+
+class TestWatchDaemonReruns(TestBase):
+    """Test the daemon against a throwaway project tree."""
+
+    def setUp(self):
+        """Create a temporary project with a helper package and two test modules."""
+        super().setUp()
+        self.project = ScratchProject()
+        self.lib = self.project.package_name("wd_lib")
+        self.suite = self.project.package_name("wd_suite")
+        self.project.write(f"{self.lib}/__init__.py", "")
+        self.project.write(f"{self.lib}/values.py", "ANSWER = 42\n")
+        self.project.write(f"{self.suite}/__init__.py", "")
+        self.project.write(f"{self.suite}/test_uses_lib.py", f"""
+            import unittest
+            from {self.lib} import values
+
+            class TestAnswer(unittest.TestCase):
+                def test_answer(self):
+                    self.assertEqual(42, values.ANSWER)
+            """)
+        self.project.write(f"{self.suite}/test_standalone.py", """
+            import unittest
+
+            class TestStandalone(unittest.TestCase):
+                def test_truth(self):
+                    self.assertTrue(True)
+            """)
+        self.report = ReportGenerator(output_dir=str(self.project.root / "reports"))
+        self.streamed = []
+        self.daemon = WatchDaemon(str(self.project.root), watch_dirs=(self.lib, self.suite),
+                                  workers=2, report=self.report,
+                                  on_result=self.streamed.append)
+        self.daemon.preload()
+
+    def tearDown(self):
+        """Remove the temporary project and its modules."""
+        self.project.cleanup()
+        super().tearDown()
+
+    def test_run_all_streams_results(self):
+        """Test every preloaded class runs and streams into the report."""
+        results = self.daemon.run_all()
+        self.assert_equals(2, len(results))
+        self.assert_true(all(r["passed"] for r in results))
+        self.assert_equals(2, self.report.generate_summary()["total_tests"])
+        self.assert_equals(2, len(self.streamed))
+
+    def test_no_change_no_rerun(self):
+        """Test polling without edits runs nothing."""
+        self.assert_equals([], self.daemon.step())
+
+    def test_dependency_change_reruns_dependents_only(self):
+        """Test editing a helper reloads it and reruns only dependent tests."""
+        self.project.write(f"{self.lib}/values.py", "ANSWER = 41\n")
+        results = self.daemon.step()
+        self.assert_equals([f"{self.suite}.test_uses_lib.TestAnswer.test_answer"],
+                           [r["test_name"] for r in results])
+        self.assert_false(results[0]["passed"])
+        self.assert_true("AssertionError" in results[0]["error"])
+
+    def test_test_module_change_reruns_module(self):
+        """Test editing a test module reruns just that module's classes."""
+        self.project.write(f"{self.suite}/test_standalone.py", """
+            import unittest
+
+            class TestStandalone(unittest.TestCase):
+                def test_truth(self):
+                    self.assertTrue(True)
+
+                def test_more(self):
+                    self.assertEqual(2, 1 + 1)
+            """)
+        results = self.daemon.step()
+        self.assert_equals(2, len(results))
+        self.assert_true(all(".test_standalone." in r["test_name"] for r in results))
+
+    def test_class_setup_failure_reported(self):
+        """Test a setUpClass error is streamed as a failed result, not dropped."""
+        self.project.write(f"{self.suite}/test_standalone.py", """
+            import unittest
+
+            class TestStandalone(unittest.TestCase):
+                @classmethod
+                def setUpClass(cls):
+                    raise RuntimeError("fixture unavailable")
+
+                def test_truth(self):
+                    self.assertTrue(True)
+            """)
+        results = self.daemon.step()
+        self.assert_equals(1, len(results))
+        self.assert_false(results[0]["passed"])
+        self.assert_true(results[0]["test_name"].startswith("setUpClass ("))
+        self.assert_true("fixture unavailable" in results[0]["error"])
+        self.assert_equals(1, self.report.generate_summary()["failed"])
+
+    def test_affected_modules_order(self):
+        """Test dependencies are reloaded before their dependents."""
+        order = self.daemon.affected_modules({f"{self.lib}.values"})
+        self.assert_true(order.index(f"{self.lib}.values")
+                         < order.index(f"{self.suite}.test_uses_lib"))
+        self.assert_false(f"{self.suite}.test_standalone" in order)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,125 @@
+"""
+Spectra Ancillary State Machine Regression Tests
+Tests for the ancillary state-machine model and its reachability explorer.
+"""
+
+import itertools
+import unittest
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from framework.test_base import TestBase
+from framework.fixtures import TestFixtures
+from framework.state_machine import SpectraStateMachine, StateSpaceExplorer
+
+
+class TestSpectraStateMachineModel(TestBase):
+    """Test transitions and guards of the ancillary state machine."""
+
+    def setUp(self):
+        """Set up state machine tests."""
+        super().setUp()
+        spectra_data = TestFixtures.get_sample_spectra_python_integration()
+        self.machine = SpectraStateMachine(spectra_data["configuration"],
+                                           initial_status=spectra_data["status"])
+
+    def test_fixture_status_is_initial_state(self):
+        """Test the fixture status is the model's initial state."""
+        self.assert_equals(("initialized", 0), self.machine.initial)
+
+    def test_lifecycle_sequence(self):
+        """Test the start/pause/resume/stop lifecycle."""
+        state = self.machine.run(["start", "pause", "resume", "stop"])
+        self.assert_equals("stopped", state[0])
+
+    def test_invalid_transition_rejected(self):
+        """Test an event not enabled in the current state raises."""
+        with self.assertRaises(ValueError):
+            self.machine.run(["pause"])
+
+    def test_recovery_guard_limits_retries(self):
+        """Test recovery is allowed only while retry attempts remain."""
+        cycle = ["fail", "recover", "resume"]
+        state = self.machine.run(["start"] + cycle * 3 + ["fail"])
+        self.assert_equals(("error", 3), state)
+        names = [t.name for t in self.machine.enabled(state)]
+        self.assert_equals(["abort"], names)
+
+    def test_reset_clears_retries(self):
+        """Test reset returns to initialized with a fresh retry budget."""
+        state = self.machine.run(["start", "fail", "recover", "stop", "reset"])
+        self.assert_equals(("initialized", 0), state)
+
+
+class TestSpectraStateSpaceExplorer(TestBase):
+    """Test exhaustive exploration of ancillary transition sequences."""
+
+    def setUp(self):
+        """Set up explorer tests."""
+        super().setUp()
+        config = TestFixtures.get_sample_spectra_python_integration()["configuration"]
+        self.machine = SpectraStateMachine(config)
+
+    def test_all_statuses_reachable(self):
+        """Test every modelled status is reachable within a modest depth."""
+        result = StateSpaceExplorer(self.machine, max_depth=12).explore()
+        self.assert_equals(set(SpectraStateMachine.STATES), result["statuses_covered"])
+        self.assert_equals({"start", "pause", "resume", "stop", "fail",
+                            "recover", "abort", "reset"}, result["transitions_covered"])
+
+    def test_recovery_path_witness(self):
+        """Test the explorer finds the shortest recovery path."""
+        result = StateSpaceExplorer(self.machine, max_depth=6).explore()
+        self.assert_equals(["start", "fail", "recover"],
+                           result["witness"][("recovered", 1)])
+
+    def test_sequence_count_matches_brute_force(self):
+        """Test memoized sequence counting against explicit enumeration."""
+        depth = 6
+        expected = 0
+        for length in range(1, depth + 1):
+            for events in itertools.product(
+                    [t.name for t in self.machine.transitions], repeat=length):
+                try:
+                    self.machine.run(events)
+                    expected += 1
+                except ValueError:
+                    pass
+        explorer = StateSpaceExplorer(self.machine, max_depth=depth)
+        self.assert_equals(expected, explorer.count_sequences())
+
+    def test_deep_exploration_is_memoized(self):
+        """Test deep bounds stay cheap because states are expanded once."""
+        result = StateSpaceExplorer(self.machine, max_depth=200).explore()
+        self.assert_equals(len(result["reachable"]), sum(result["level_sizes"]))
+        self.assert_true(result["sequence_count"] > 10 ** 20)
+
+    def test_very_deep_bound_does_not_recurse(self):
+        """Test depth bounds far beyond the recursion limit still count and prune."""
+        explorer = StateSpaceExplorer(self.machine, max_depth=1500)
+        result = explorer.explore()
+        self.assert_true(result["sequence_count"] > 10 ** 100)
+        self.assert_equals(["start", "fail", "recover"],
+                           explorer.sequences_to("recovered", limit=1)[0])
+
+    def test_sequences_to_recovered(self):
+        """Test enumeration of sequences ending in the recovered state."""
+        explorer = StateSpaceExplorer(self.machine, max_depth=5)
+        sequences = explorer.sequences_to("recovered", limit=5)
+        self.assert_equals(["start", "fail", "recover"], sequences[0])
+        for events in sequences:
+            self.assert_equals("recovered", self.machine.run(events)[0])
+
+    def test_process_pool_matches_serial(self):
+        """Test frontier expansion over a process pool gives identical results."""
+        serial = StateSpaceExplorer(self.machine, max_depth=20).explore()
+        parallel = StateSpaceExplorer(self.machine, max_depth=20, workers=2,
+                                      min_parallel_frontier=1).explore()
+        self.assert_equals(serial["reachable"], parallel["reachable"])
+        self.assert_equals(serial["edges"], parallel["edges"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -12,6 +12,7 @@ sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
 from framework.test_base import TestBase
 from framework.fixtures import TestFixtures
+from framework.timestamps import parse_iso8601
 
 
 class TestTILEInitialization(TestBase):
@@ -110,6 +111,7 @@ class TestTILEIntegration(TestBase):
         timestamp = self.tile_data["timestamp"]
         self.assert_not_none(timestamp)
         self.assert_true(len(timestamp) > 0)
+        self.assert_true(parse_iso8601([timestamp])[0] > 0)
 
 
 class TestTILEPythonExamples(TestBase):
@@ -0,0 +1,168 @@
+"""
+TILE Pyramid Regression Tests
+Tests for multi-zoom GPS density aggregation and the on-disk tile store.
+"""
+
+import os
+import sqlite3
+import tempfile
+import unittest
+import sys
+from pathlib import Path
+from unittest import mock
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from framework.test_base import TestBase
+from framework.fixtures import TestFixtures
+from framework.tile_pyramid import (
+    TilePyramid, lonlat_to_tile, morton_decode, morton_encode,
+)
+
+
+def _fixes(count: int, seed: int = 0):
+    """Simulated fixes scattered around the EMQuest fixture location."""
+    rng = np.random.default_rng(seed)
+    location = TestFixtures.get_sample_emquest_gps_data()["location"]
+    latitude = location["latitude"] + rng.normal(0, 0.2, count)
+    longitude = location["longitude"] + rng.normal(0, 0.2, count)
+    accuracy = rng.uniform(0.5, 10.0, count)
+    return latitude, longitude, accuracy
+
+
+class TestTileIndexing(TestBase):
+    """Test tile indexing and Morton keys."""
+
+    def test_morton_round_trip(self):
+        """Test Morton keys decode to the original tile indices."""
+        rng = np.random.default_rng(1)
+        x = rng.integers(0, 2 ** 30, 1000)
+        y = rng.integers(0, 2 ** 30, 1000)
+        dx, dy = morton_decode(morton_encode(x, y))
+        self.assert_true(np.array_equal(x, dx))
+        self.assert_true(np.array_equal(y, dy))
+
+    def test_parent_is_key_shift(self):
+        """Test shifting a key by two bits gives the parent tile."""
+        x, y = np.array([13]), np.array([6])
+        parent = morton_decode(morton_encode(x, y) >> 2)
+        self.assert_equals((6, 3), (int(parent[0][0]), int(parent[1][0])))
+
+    def test_known_tile(self):
+        """Test Austin falls in the expected slippy-map tile at zoom 10."""
+        x, y = lonlat_to_tile(np.array([30.2672]), np.array([-97.7431]), 10)
+        self.assert_equals((233, 421), (int(x[0]), int(y[0])))
+
+
+class TestTilePyramidAggregation(TestBase):
+    """Test bottom-up aggregation and incremental updates."""
+
+    def setUp(self):
+        """Set up a pyramid sized from the TILE fixture grid."""
+        super().setUp()
+        tile_config = TestFixtures.get_sample_tile_data()["data"]
+        self.pyramid = TilePyramid.from_tile_config(tile_config)
+
+    def tearDown(self):
+        """Close the tile store."""
+        self.pyramid.close()
+        super().tearDown()
+
+    def test_levels_from_grid_size(self):
+        """Test a 1024 grid yields zoom levels 0..10."""
+        self.assert_equals(10, self.pyramid.max_zoom)
+
+    def test_counts_conserved_at_every_zoom(self):
+        """Test every zoom level accounts for every fix."""
+        latitude, longitude, accuracy = _fixes(50_000)
+        self.pyramid.add_batch(latitude, longitude, accuracy)
+        for zoom in range(self.pyramid.max_zoom + 1):
+            self.assert_equals(50_000, int(self.pyramid.tiles(zoom)["count"].sum()))
+        root = self.pyramid.tile(0, 0, 0)
+        self.assertAlmostEqual(accuracy.mean(), root["mean_accuracy"])
+        self.assertAlmostEqual(accuracy.std(), root["std_accuracy"], places=6)
+        self.assertAlmostEqual(accuracy.max(), root["max_accuracy"])
+
+    def test_matches_direct_binning(self):
+        """Test a level matches binning the fixes directly at that zoom."""
+        latitude, longitude, accuracy = _fixes(20_000)
+        self.pyramid.add_batch(latitude, longitude, accuracy)
+        x, y = lonlat_to_tile(latitude, longitude, 7)
+        expected = len(np.unique(morton_encode(x, y)))
+        self.assert_equals(expected, self.pyramid.coverage(7))
+
+    def test_incremental_equals_single_batch(self):
+        """Test several batches give the same tiles as one combined batch."""
+        latitude, longitude, accuracy = _fixes(30_000)
+        for part in np.array_split(np.arange(30_000), 3):
+            self.pyramid.add_batch(latitude[part], longitude[part], accuracy[part])
+        combined = TilePyramid(self.pyramid.max_zoom)
+        combined.add_batch(latitude, longitude, accuracy)
+        for zoom in (0, 5, 10):
+            incremental, single = self.pyramid.tiles(zoom), combined.tiles(zoom)
+            self.assert_true(np.array_equal(incremental["count"], single["count"]))
+            self.assert_true(np.allclose(incremental["mean_accuracy"],
+                                         single["mean_accuracy"]))
+        combined.close()
+
+    def test_batch_touches_only_its_tiles(self):
+        """Test a small far-away batch writes one tile per zoom level."""
+        self.pyramid.add_batch(*_fixes(10_000))
+        touched = self.pyramid.add_batch(np.array([-33.86]), np.array([151.21]),
+                                         np.array([2.0]))
+        self.assert_equals(self.pyramid.max_zoom + 1, touched)
+
+    def test_non_finite_fixes_skipped(self):
+        """Test NaN or infinite fixes are dropped instead of landing in tile (0, 0)."""
+        latitude, longitude, accuracy = _fixes(1_000)
+        latitude[:10], longitude[10:20], accuracy[20:30] = np.nan, np.inf, np.nan
+        self.pyramid.add_batch(latitude, longitude, accuracy)
+        self.assert_equals(970, self.pyramid.tile(0, 0, 0)["count"])
+        self.assert_equals(None, self.pyramid.tile(self.pyramid.max_zoom, 0, 0))
+        self.assert_equals(0, self.pyramid.add_batch(np.array([np.nan]), np.array([1.0]),
+                                                     np.array([2.0])))
+
+    def test_coverage_with_accuracy_filter(self):
+        """Test coverage can require a maximum mean accuracy."""
+        latitude, longitude, _ = _fixes(5_000)
+        self.pyramid.add_batch(latitude, longitude, np.full(5_000, 3.0))
+        self.assert_equals(self.pyramid.coverage(6),
+                           self.pyramid.coverage(6, max_mean_accuracy=5.0))
+        self.assert_equals(0, self.pyramid.coverage(6, max_mean_accuracy=1.0))
+
+
+class TestTilePyramidStore(TestBase):
+    """Test persistence of the on-disk tile store."""
+
+    def test_store_reopens_and_continues(self):
+        """Test tiles persist across reopen and new batches add to them."""
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "tiles.sqlite")
+            pyramid = TilePyramid(8, path)
+            pyramid.add_batch(*_fixes(1_000, seed=1))
+            pyramid.close()
+
+            reopened = TilePyramid(8, path)
+            self.assert_equals(1_000, reopened.tile(0, 0, 0)["count"])
+            reopened.add_batch(*_fixes(500, seed=2))
+            self.assert_equals(1_500, reopened.tile(0, 0, 0)["count"])
+            reopened.close()
+
+            opened, real_connect = [], sqlite3.connect
+
+            def connect(*args):
+                opened.append(real_connect(*args))
+                return opened[-1]
+
+            with mock.patch("framework.tile_pyramid.sqlite3.connect", connect):
+                with self.assertRaises(ValueError):
+                    TilePyramid(9, path)
+            # The rejected store's connection is closed, not leaked.
+            with self.assertRaises(sqlite3.ProgrammingError):
+                opened[0].execute("SELECT 1")
+
+
+if __name__ == "__main__":
+    unittest.main()
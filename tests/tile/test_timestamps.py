@@ -0,0 +1,141 @@
+"""
+TILE Timestamp Regression Tests
+Tests for bulk ISO-8601 parsing and recorded-trace timing checks.
+"""
+
+import tempfile
+import unittest
+import sys
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from framework.test_base import TestBase
+from framework.fixtures import TestFixtures
+from framework.report_generator import ReportGenerator
+from framework.timestamps import NS_PER_SECOND, check_timestamps, parse_iso8601
+
+
+class TestTimestampParsing(TestBase):
+    """Test bulk ISO-8601 parsing to epoch nanoseconds."""
+
+    def test_parse_matches_datetime(self):
+        """Test parsed values match datetime for assorted formats."""
+        samples = [
+            "2026-03-15T18:30:00",
+            "2026-03-15 18:30:00.5",
+            "2026-03-15T18:30:00.123456Z",
+            "2026-03-15T18:30:00+02:00",
+            "2026-03-15T18:30:00.25-0530",
+            "2000-02-29T00:00:00Z",
+        ]
+        parsed = parse_iso8601(samples)
+        for text, value in zip(samples, parsed.tolist()):
+            expected = datetime.fromisoformat(text.replace("Z", "+00:00"))
+            if expected.tzinfo is None:
+                expected = expected.replace(tzinfo=timezone.utc)
+            epoch = datetime(1970, 1, 1, tzinfo=timezone.utc)
+            micros = (expected - epoch) // timedelta(microseconds=1)
+            self.assert_equals(micros * 1000, value, text)
+
+    def test_nanosecond_fraction(self):
+        """Test nine-digit fractions keep nanoseconds and extra digits truncate."""
+        parsed = parse_iso8601(["1970-01-01T00:00:00.123456789",
+                                "1970-01-01T00:00:00.1234567899Z"])
+        self.assert_equals([123456789, 123456789], parsed.tolist())
+
+    def test_fixture_timestamps_parse(self):
+        """Test every fixture timestamp parses."""
+        timestamps = [
+            TestFixtures.get_sample_tile_data()["timestamp"],
+            TestFixtures.get_sample_emquest_gps_data()["timestamp"],
+            TestFixtures.get_sample_aurora_data()["timestamp"],
+        ]
+        parsed = parse_iso8601(timestamps)
+        self.assert_true((parsed > 0).all())
+
+    def test_invalid_timestamps_rejected(self):
+        """Test malformed timestamps raise ValueError naming the row."""
+        for bad in ["2026-13-01T00:00:00", "2026-03-15T18:30", "2026-03-15T18:30:00.",
+                    "2026-03-15T18:30:00+02", "2026-03-15T18:30:00Zx", ""]:
+            with self.assertRaises(ValueError):
+                parse_iso8601(["2026-03-15T18:30:00", bad])
+
+    def test_calendar_and_offset_ranges(self):
+        """Test day-of-month, leap years, year range and offset fields are checked."""
+        for bad in ["2026-02-29T00:00:00", "2026-02-31T00:00:00", "1900-02-29T00:00:00",
+                    "2026-04-31T00:00:00", "1677-12-31T00:00:00", "2262-01-01T00:00:00",
+                    "2026-03-15T18:30:00+24:00", "2026-03-15T18:30:00+99:99",
+                    "2026-03-15T18:30:00-0160"]:
+            with self.assertRaises(ValueError, msg=bad):
+                parse_iso8601([bad])
+        good = ["2024-02-29T00:00:00", "2000-02-29T00:00:00", "1678-01-01T00:00:00",
+                "2261-12-31T23:59:59", "2026-03-15T18:30:00-23:59"]
+        expected = np.array([np.datetime64(g[:19], "ns") for g in good]).astype(np.int64)
+        expected[-1] += (23 * 3600 + 59 * 60) * NS_PER_SECOND
+        self.assert_true(np.array_equal(expected, parse_iso8601(good)))
+
+    def test_bulk_parse_matches_numpy(self):
+        """Test a large batch against numpy's datetime64 parser."""
+        base = np.datetime64("2026-01-01T00:00:00", "ns")
+        values = base + np.arange(200_000) * np.timedelta64(100, "ms")
+        strings = np.datetime_as_string(values)
+        parsed = parse_iso8601(strings)
+        self.assert_true(np.array_equal(values.astype(np.int64), parsed))
+
+
+class TestTimestampChecks(TestBase):
+    """Test monotonicity, duplicate, gap and jitter detection."""
+
+    def setUp(self):
+        """Set up a 10 Hz trace with injected defects."""
+        super().setUp()
+        self.ns = np.arange(1000, dtype=np.int64) * (NS_PER_SECOND // 10)
+        self.ns[500:] += 5 * NS_PER_SECOND  # one 5.1 s gap
+        self.ns[200] = self.ns[199]  # duplicate
+        self.ns[300], self.ns[301] = self.ns[301], self.ns[300]  # swap
+
+    def test_clean_trace(self):
+        """Test a regular trace reports no defects."""
+        ns = np.arange(100, dtype=np.int64) * NS_PER_SECOND
+        summary = check_timestamps(ns, max_gap_seconds=2.0)
+        self.assert_true(summary["monotonic"])
+        self.assert_equals(0, summary["gaps"])
+        self.assertAlmostEqual(1.0, summary["sampling_rate_hz"])
+        self.assertAlmostEqual(0.0, summary["jitter_rms_seconds"])
+
+    def test_defects_detected(self):
+        """Test injected defects are counted."""
+        summary = check_timestamps(self.ns, max_gap_seconds=1.0)
+        self.assert_false(summary["monotonic"])
+        self.assert_equals(1, summary["non_monotonic"])
+        self.assert_equals(301, summary["first_non_monotonic_index"])
+        self.assert_equals(1, summary["duplicates"])
+        self.assert_equals(1, summary["gaps"])
+        self.assertAlmostEqual(5.1, summary["largest_gap_seconds"])
+        self.assertAlmostEqual(10.0, summary["sampling_rate_hz"])
+
+    def test_jitter_against_expected_interval(self):
+        """Test jitter is measured against the nominal interval."""
+        rng = np.random.default_rng(3)
+        ns = np.cumsum(rng.normal(0.1, 0.001, 10_000) * NS_PER_SECOND).astype(np.int64)
+        summary = check_timestamps(ns, max_gap_seconds=1.0, expected_interval_seconds=0.1)
+        self.assertAlmostEqual(0.001, summary["jitter_rms_seconds"], delta=0.0001)
+
+    def test_summary_in_report(self):
+        """Test the summary can be added to the HTML and JSON report."""
+        summary = check_timestamps(self.ns, max_gap_seconds=1.0)
+        with tempfile.TemporaryDirectory() as tmp:
+            report = ReportGenerator(output_dir=tmp)
+            report.add_section("TILE trace timing", summary)
+            html = Path(report.save_html_report()).read_text()
+            json_text = Path(report.save_json_report()).read_text()
+        self.assert_true("TILE trace timing" in html)
+        self.assert_true("largest_gap_seconds" in json_text)
+
+
+if __name__ == "__main__":
+    unittest.main()